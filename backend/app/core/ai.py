@@ -1,36 +1,175 @@
-from google import genai
-from google.genai import types
+from app.core import metrics
+from app.core.cache import DiskCache, TTLCache
 from app.core.config import settings
+import asyncio
+import hashlib
 import json
+import threading
+import time
+import weakref
 
 DEFAULT_AI_RESPONSE = {
     "description": "AI unavailable. Please describe manually.",
     "advice": ["Stay calm.", "Check for injuries.", "Wait for help."]
 }
 
+PROMPT = "Analyze the image and return JSON with fields: description, advice, condition."
+
+
+# raised when no analysis slot frees up within AI_QUEUE_TIMEOUT_SECONDS
+class AIBusyError(Exception):
+    pass
+
+
+_client = None
+_client_lock = threading.Lock()
+
+# one semaphore per event loop (asyncio primitives are loop bound)
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+# single client per process, its HTTP connections are reused across calls.
+# The Gemini SDK takes ~0.5 s to import, so it is loaded with the first analysis
+# instead of on every (serverless) cold start
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from google import genai
+                from google.genai import types
+
+                _client = genai.Client(
+                    api_key=settings.GEMINI_API_KEY,
+                    http_options=types.HttpOptions(timeout=int(settings.AI_TIMEOUT_SECONDS * 1000)),
+                )
+    return _client
+
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+    return _semaphores[loop]
+
+
+# analysis results keyed by image + prompt + model: an LRU in memory and an
+# optional directory shared by the workers of one host
+memory_cache = TTLCache(ttl=settings.AI_CACHE_TTL_SECONDS, maxsize=settings.AI_CACHE_MAX_ENTRIES)
+disk_cache = (
+    DiskCache(settings.AI_CACHE_DIR, settings.AI_CACHE_TTL_SECONDS, settings.AI_CACHE_DISK_MAX_BYTES)
+    if settings.AI_CACHE_DIR else None
+)
+
+
+def cache_key(image_bytes: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (settings.AI_MODEL.encode(), PROMPT.encode(), image_bytes):
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+def cached_result(key: str):
+    result = memory_cache.get(key)
+    if result is None and disk_cache is not None:
+        result = disk_cache.get(key)
+        if result is not None:
+            memory_cache.set(key, result)
+    return result
+
+
+def store_result(key: str, result: dict):
+    memory_cache.set(key, result)
+    if disk_cache is not None:
+        disk_cache.set(key, result)
+
+
+def cache_stats() -> dict:
+    stats = {"memory_hits": memory_cache.hits, "memory_misses": memory_cache.misses}
+    if disk_cache is not None:
+        stats.update(disk_hits=disk_cache.hits, disk_misses=disk_cache.misses)
+    return stats
+
+
+def _request(image_bytes: bytes, mime_type: str) -> dict:
+    from google.genai import types
+
+    return dict(
+        model=settings.AI_MODEL,
+        contents=[
+            PROMPT,
+            types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
+        ],
+        config=types.GenerateContentConfig(
+            response_mime_type="application/json",
+            temperature=0.1
+        )
+    )
+
 
 def analyze_image_for_description(image_bytes: bytes, mime_type: str = "image/jpeg") -> dict:
 
     if not settings.GEMINI_API_KEY:
         return DEFAULT_AI_RESPONSE
 
+    start = time.perf_counter()
+    key = cache_key(image_bytes)
+    result = cached_result(key)
+    if result is not None:
+        metrics.observe_ai("cached", time.perf_counter() - start)
+        return result
+
     try:
-        
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=[
-                "Analyze the image and return JSON with fields: description, advice, condition.",
-                types.Part.from_bytes(data=image_bytes, mime_type=mime_type)  
-            ],
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",  
-                temperature=0.1
-            )
-        )
+        response = get_client().models.generate_content(**_request(image_bytes, mime_type))
 
         # convert AI response to dictionary
-        return json.loads(response.text)
+        result = json.loads(response.text)
+        store_result(key, result)
+        metrics.observe_ai("ok", time.perf_counter() - start)
+        return result
 
     except Exception as e:
-        return DEFAULT_AI_RESPONSE
\ No newline at end of file
+        metrics.observe_ai("error", time.perf_counter() - start)
+        return DEFAULT_AI_RESPONSE
+
+
+# async version for request handlers: never blocks the event loop, at most
+# AI_MAX_CONCURRENCY calls in flight per worker, each capped at AI_TIMEOUT_SECONDS
+async def analyze_image_async(image_bytes: bytes, mime_type: str = "image/jpeg") -> dict:
+
+    if not settings.GEMINI_API_KEY:
+        return DEFAULT_AI_RESPONSE
+
+    # repeat submissions of the same photo skip the model call and the queue
+    start = time.perf_counter()
+    key = cache_key(image_bytes)
+    result = await asyncio.to_thread(cached_result, key)
+    if result is not None:
+        metrics.observe_ai("cached", time.perf_counter() - start)
+        return result
+
+    semaphore = _semaphore()
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=settings.AI_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        metrics.observe_ai("busy", time.perf_counter() - start)
+        raise AIBusyError()
+
+    try:
+        response = await asyncio.wait_for(
+            get_client().aio.models.generate_content(**_request(image_bytes, mime_type)),
+            timeout=settings.AI_TIMEOUT_SECONDS,
+        )
+        result = json.loads(response.text)
+        await asyncio.to_thread(store_result, key, result)
+        metrics.observe_ai("ok", time.perf_counter() - start)
+        return result
+
+    except Exception as e:
+        metrics.observe_ai("error", time.perf_counter() - start)
+        return DEFAULT_AI_RESPONSE
+
+    finally:
+        semaphore.release()
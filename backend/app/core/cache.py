@@ -0,0 +1,193 @@
+# Small in-process caches (per worker, thread safe)
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+# LRU cache whose entries expire after `ttl` seconds. With `stale_ttl` > 0 an
+# expired entry is still served for that long while a background thread
+# reloads it (stale-while-revalidate).
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: int = 1024, stale_ttl: float = 0):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._refreshing: set = set()
+        self._generation = 0  # bumped on invalidate so in-flight loads don't write back
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Hashable):
+        # returns (value, age) or None
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        age = time.monotonic() - stored_at
+        if age > self.ttl + self.stale_ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value, age
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            found = self._lookup(key)
+            if found is None or found[1] > self.ttl:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return found[0]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        refresh: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        with self._lock:
+            found = self._lookup(key)
+            if found is not None:
+                value, age = found
+                if age <= self.ttl:
+                    self.hits += 1
+                    return value
+                # stale: serve it and reload once in the background
+                if refresh is not None:
+                    self.hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(key, refresh, self._generation),
+                            daemon=True,
+                        ).start()
+                    return value
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        self.set(key, value, generation)
+        return value
+
+    def _refresh(self, key: Hashable, refresh: Callable[[], Any], generation: int) -> None:
+        try:
+            self.set(key, refresh(), generation)
+        except Exception:
+            pass  # keep serving the stale value until it ages out
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+# JSON values on disk, one file per key. Entries older than `ttl` are misses;
+# once the directory grows past `max_bytes` the least recently written files
+# are removed.
+class DiskCache:
+    def __init__(self, directory: str, ttl: float, max_bytes: int):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self):
+        # (path, size, mtime) for every cached file
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _expired(self, mtime: float) -> bool:
+        return time.time() - mtime > self.ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            if self._expired(os.path.getmtime(path)):
+                self._remove_expired(path)
+                raise FileNotFoundError
+            with open(path) as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return default
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    # checked again under the lock: a concurrent set may have just rewritten it
+    def _remove_expired(self, path: str) -> None:
+        with self._lock:
+            try:
+                stat = os.stat(path)
+                if self._expired(stat.st_mtime):
+                    os.unlink(path)
+                    self._size -= stat.st_size
+            except FileNotFoundError:
+                pass
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        data = json.dumps(value).encode()
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+
+        with self._lock:
+            # an overwritten entry no longer counts towards the size
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+            self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    # drop oldest files until the cache is back under 90% of max_bytes
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        size = sum(e[1] for e in entries)
+        target = self.max_bytes * 0.9
+        for path, file_size, _ in entries:
+            if size <= target:
+                break
+            try:
+                os.unlink(path)
+                size -= file_size
+            except FileNotFoundError:
+                pass
+        self._size = size
@@ -0,0 +1,137 @@
+# gzip / brotli response compression
+#
+# Report payloads are mostly free text (description, field review) and shrink
+# 5-10x. Bodies under COMPRESSION_MIN_BYTES are sent as they are, so are media
+# types that are already compressed (photos) or must not be buffered (event
+# streams). Streamed responses (exports) are compressed chunk by chunk and
+# flushed after each one, so clients keep receiving rows as they are produced.
+# A compressed body is a different representation: its ETag is made weak, which
+# the conditional request checks compare weakly anyway.
+
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def supported() -> List[str]:
+    encodings = [e.strip() for e in settings.COMPRESSION_ENCODINGS.split(",") if e.strip()]
+    return [e for e in encodings if e == "gzip" or (e == "br" and brotli is not None)]
+
+
+# first configured encoding the client accepts (q=0 refuses one)
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted, refused = set(), set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        q = params.strip().removeprefix("q=")
+        try:
+            (refused if params and float(q) == 0 else accepted).add(name)
+        except ValueError:
+            accepted.add(name)
+    for encoding in supported():
+        if encoding not in refused and (encoding in accepted or "*" in accepted):
+            return encoding
+    return None
+
+
+def is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/event-stream":
+        return False
+    return (
+        content_type.startswith("text/")
+        or content_type in COMPRESSIBLE_TYPES
+        or content_type.endswith("+json")
+    )
+
+
+# (compress, flush, finish) for one response body
+def compressor(encoding: str) -> Tuple[Callable, Callable, Callable]:
+    if encoding == "br":
+        c = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return c.process, c.flush, c.finish
+    c = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return c.compress, lambda: c.flush(zlib.Z_SYNC_FLUSH), c.flush
+
+
+class CompressionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        encoding = None
+        if scope["type"] == "http":
+            encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compress = flush = finish = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compress, flush, finish, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compress is None:
+                headers = MutableHeaders(raw=start.setdefault("headers", []))
+                if not is_compressible(headers) or (
+                    not more_body and len(body) < settings.COMPRESSION_MIN_BYTES
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                compress, flush, finish = compressor(encoding)
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["etag"] = "W/" + etag
+
+                if not more_body:
+                    body = compress(body) + finish()
+                    headers["content-length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                del headers["content-length"]
+                await send(start)
+
+            if more_body:
+                body = compress(body) + flush()
+            else:
+                body = compress(body) + finish()
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -7,17 +8,155 @@ class Settings(BaseSettings):
     # database url from .env
     DATABASE_URL: str = ""
 
+    # connection pooling: "queue" keeps connections open in long-lived workers
+    # (gunicorn/uvicorn), "null" opens one per session (serverless), "auto"
+    # picks "null" on Vercel and "queue" everywhere else
+    DB_POOL_MODE: str = "auto"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # serve report CRUD and auth through an AsyncSession (asyncpg) instead of
+    # sync sessions in the threadpool
+    DB_ASYNC: bool = False
+
+    # set by the Vercel runtime
+    VERCEL: Optional[str] = None
+
     # jwt authentication settings
     SECRET_KEY: str = "secretkey123"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # pbkdf2_sha256 rounds for new hashes (existing hashes are upgraded on login)
+    # and hashing processes (unset: one per core, 0 runs inline, default on serverless)
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+
+    # cache of authenticated users (per worker): a deleted user keeps access
+    # through other workers for up to AUTH_CACHE_TTL_SECONDS
+    AUTH_CACHE_TTL_SECONDS: float = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10_000
+
     # gemini api key
     GEMINI_API_KEY: str = ""
 
+    # gemini image analysis: model, per worker concurrency cap, how long a
+    # request may wait for a free slot and the per call deadline (seconds)
+    AI_MODEL: str = "gemini-2.5-flash"
+    AI_MAX_CONCURRENCY: int = 4
+    AI_QUEUE_TIMEOUT_SECONDS: float = 5
+    AI_TIMEOUT_SECONDS: float = 20
+
+    # cache of analysis results; AI_CACHE_DIR enables a second, on-disk tier
+    AI_CACHE_TTL_SECONDS: float = 24 * 60 * 60
+    AI_CACHE_MAX_ENTRIES: int = 512
+    AI_CACHE_DIR: str = ""
+    AI_CACHE_DISK_MAX_BYTES: int = 50 * 1024 * 1024
+
+    # report photo storage ("local" directory or "s3" compatible bucket)
+    PHOTO_STORAGE_BACKEND: str = "local"
+    PHOTO_STORAGE_DIR: str = "storage/photos"
+    PHOTO_S3_BUCKET: str = ""
+    PHOTO_S3_PREFIX: str = "photos/"
+    PHOTO_S3_ENDPOINT_URL: str = ""
+    PHOTO_MAX_BYTES: int = 15 * 1024 * 1024
+
+    # uploaded photos are re-encoded (EXIF stripped) to IMAGE_FORMAT (WEBP or JPEG)
+    # within IMAGE_MAX_DIMENSION pixels, plus a thumbnail for list views.
+    # IMAGE_WORKERS processes do the work (unset: one per core, 0 on serverless)
+    IMAGE_MAX_DIMENSION: int = 1600
+    IMAGE_THUMBNAIL_DIMENSION: int = 320
+    IMAGE_FORMAT: str = "WEBP"
+    IMAGE_QUALITY: int = 80
+    IMAGE_WORKERS: Optional[int] = None
+
+    # report change events for /reports/stream and /reports/ws: "memory" (per
+    # worker) or "redis" to fan out across workers/hosts through EVENT_BUS_URL
+    EVENT_BUS_BACKEND: str = "memory"
+    EVENT_BUS_URL: str = "redis://localhost:6379/0"
+    # connect/read timeout for publishing, so a down Redis cannot stall writes
+    EVENT_BUS_TIMEOUT_SECONDS: float = 2
+    EVENT_STREAM_KEEPALIVE_SECONDS: float = 15
+
+    # automatic rescue team assignment of new reports: "balanced" (priority
+    # weighted workload + distance to the team's open reports), "priority" or
+    # "least_loaded"; ASSIGNMENT_KM_PER_WEIGHT km weigh as much as one low
+    # priority report. The workload index is reloaded from the database every
+    # ASSIGNMENT_INDEX_TTL_SECONDS to pick up other workers' writes
+    ASSIGNMENT_POLICY: str = "balanced"
+    ASSIGNMENT_KM_PER_WEIGHT: float = 10
+    ASSIGNMENT_INDEX_TTL_SECONDS: float = 60
+
+    # spatial lookups for /reports/nearby: "grid" (indexed geo_cell column, any
+    # database) or "postgis" (GiST index, needs the PostGIS extension)
+    GEO_INDEX: str = "grid"
+
+    # background jobs (photo processing, background AI analysis, notifications):
+    # "database" (jobs table, durable and shared by all workers) or "memory" (per
+    # worker). JOBS_WORKERS asyncio workers per process (unset: 4, 0 on
+    # serverless where jobs run inline). Failed attempts are retried up to
+    # JOBS_MAX_ATTEMPTS times with exponential backoff; finished jobs are kept
+    # for JOBS_RESULT_TTL_SECONDS
+    JOBS_BACKEND: str = "database"
+    JOBS_WORKERS: Optional[int] = None
+    JOBS_POLL_INTERVAL_SECONDS: float = 1
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_TIMEOUT_SECONDS: float = 120
+    JOBS_RETRY_BACKOFF_SECONDS: float = 2
+    JOBS_RETRY_BACKOFF_MAX_SECONDS: float = 300
+    JOBS_RESULT_TTL_SECONDS: float = 24 * 60 * 60
+
+    # webhook POSTed a JSON summary of every new report (empty: disabled)
+    NOTIFY_WEBHOOK_URL: str = ""
+    NOTIFY_TIMEOUT_SECONDS: float = 10
+
+    # request metrics at /metrics in Prometheus text format (per worker process);
+    # when METRICS_TOKEN is set scrapers must send "Authorization: Bearer <token>";
+    # on serverless the endpoint is only registered with a token.
+    # METRICS_SERVER_TIMING adds a Server-Timing header (app, db and ai time)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""
+    METRICS_SERVER_TIMING: bool = False
+
+    # statements slower than SLOW_QUERY_MS are logged (SQL, parameter types and
+    # the route they ran for) as warnings on the "app.slow_queries" logger; 0 disables
+    SLOW_QUERY_MS: float = 500
+
+    # admins can profile a request with ?profile=1 or an "X-Profile: 1" header:
+    # the response is replaced by a wall-clock report of stacks sampled every
+    # PROFILER_INTERVAL_MS from all threads of the worker
+    PROFILER_ENABLED: bool = True
+    PROFILER_INTERVAL_MS: float = 2
+
+    # responses of at least COMPRESSION_MIN_BYTES are compressed with the first
+    # of COMPRESSION_ENCODINGS the client accepts ("br" needs the brotli package).
+    # gzip level 4 is ~8% larger than 6 on report pages at half the CPU time
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_ENCODINGS: str = "br,gzip"
+    COMPRESSION_GZIP_LEVEL: int = 4
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # /admin/stats and /admin/public/stats cache (seconds, stale > 0 enables stale-while-revalidate)
+    STATS_CACHE_TTL_SECONDS: float = 30
+    STATS_CACHE_STALE_SECONDS: float = 0
+
     class Config:
         env_file = ".env"  # load environment variables
 
+    @property
+    def is_serverless(self) -> bool:
+        return bool(self.VERCEL)
+
+    @property
+    def db_pool_mode(self) -> str:
+        if self.DB_POOL_MODE == "auto":
+            return "null" if self.is_serverless else "queue"
+        return self.DB_POOL_MODE
+
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         # If env is not set, fallback to local pg8000 database
@@ -39,6 +178,15 @@ class Settings(BaseSettings):
         
         return url
 
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> str:
+        url = self.SQLALCHEMY_DATABASE_URI
+        if url.startswith("postgresql+pg8000://"):
+            return url.replace("postgresql+pg8000://", "postgresql+asyncpg://", 1)
+        if url.startswith("sqlite://"):
+            return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        return url
+
 
 # create settings instance
 settings = Settings()
@@ -0,0 +1,141 @@
+# Report change notifications: in-process pub/sub, optionally fanned out through
+# Redis (EVENT_BUS_BACKEND=redis) so every gunicorn worker sees every event
+
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import settings
+from app.models.user import UserRole
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "kindsteps:reports"
+
+# events kept per slow subscriber before new ones are dropped
+QUEUE_SIZE = 100
+
+
+def report_event(event_type: str, report) -> dict:
+    return {
+        "type": event_type,
+        "id": report.id,
+        "status": report.status,
+        "priority": report.priority,
+        "reporter_id": report.reporter_id,
+        "assigned_team_id": report.assigned_team_id,
+        "updated_at": report.updated_at.isoformat() if report.updated_at else None,
+    }
+
+
+# users see their own reports, rescue teams their assignments, admins everything
+def visible_to(event: dict, user) -> bool:
+    if user.role == UserRole.admin:
+        return True
+    if user.role == UserRole.rescue_team:
+        return event["assigned_team_id"] == user.id
+    return event["reporter_id"] == user.id
+
+
+class MemoryBroker:
+    # True when publish does network I/O (publish_async keeps it off the loop)
+    blocking = False
+
+    def __init__(self):
+        self._subscribers = set()  # (loop, queue)
+        self._lock = threading.Lock()
+
+    # safe to call from sync routes running in the threadpool
+    def publish(self, event: dict) -> None:
+        self.deliver(event)
+
+    def deliver(self, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._put, queue, event)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, event: dict) -> None:
+        if not queue.full():
+            queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(QUEUE_SIZE))
+        with self._lock:
+            self._subscribers.add(entry)
+        try:
+            await self.started()
+            yield entry[1]
+        finally:
+            with self._lock:
+                self._subscribers.discard(entry)
+
+    async def started(self) -> None:
+        pass
+
+
+# publishes through a Redis (or any Redis protocol) server and delivers what
+# arrives on the channel to local subscribers
+class RedisBroker(MemoryBroker):
+    blocking = True
+
+    def __init__(self, url: str):
+        super().__init__()
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("EVENT_BUS_BACKEND=redis requires the redis package") from e
+
+        self.url = url
+        self.client = redis.Redis.from_url(
+            url,
+            socket_timeout=settings.EVENT_BUS_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.EVENT_BUS_TIMEOUT_SECONDS,
+        )
+        self._listener: Optional[asyncio.Task] = None
+
+    def publish(self, event: dict) -> None:
+        self.client.publish(CHANNEL, json.dumps(event))
+
+    async def started(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        async with client.pubsub() as pubsub:
+            await pubsub.subscribe(CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self.deliver(json.loads(message["data"]))
+
+
+@lru_cache
+def get_broker() -> MemoryBroker:
+    if settings.EVENT_BUS_BACKEND == "redis":
+        return RedisBroker(settings.EVENT_BUS_URL)
+    return MemoryBroker()
+
+
+def publish(event: dict) -> None:
+    try:
+        get_broker().publish(event)
+    except Exception:
+        # notifications are best effort, never fail the write
+        logger.exception("Failed to publish %s event for report %s", event["type"], event["id"])
+
+
+# for async routes: a blocking broker publishes from a worker thread
+async def publish_async(event: dict) -> None:
+    if get_broker().blocking:
+        await asyncio.to_thread(publish, event)
+    else:
+        publish(event)
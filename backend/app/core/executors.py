@@ -0,0 +1,54 @@
+# Process pools for CPU bound work so it never holds the GIL of a request worker
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+
+_pools: Dict[str, ProcessPoolExecutor] = {}
+_lock = threading.Lock()
+
+
+# None (setting unset) -> one process per core, except on serverless where
+# spawning processes per cold start costs more than it saves
+def pool_size(configured: Optional[int]) -> int:
+    if configured is not None:
+        return configured
+    return 0 if settings.is_serverless else (os.cpu_count() or 1)
+
+
+# named pool, created on first use; None when workers is 0 (run inline)
+def get_pool(name: str, workers: int) -> Optional[ProcessPoolExecutor]:
+    if workers <= 0:
+        return None
+    pool = _pools.get(name)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = _pools[name] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+
+def run_in_pool(name: str, workers: int, fn: Callable, *args):
+    pool = get_pool(name, workers)
+    if pool is None:
+        return fn(*args)
+    return pool.submit(fn, *args).result()
+
+
+async def run_in_pool_async(name: str, workers: int, fn: Callable, *args):
+    pool = get_pool(name, workers)
+    if pool is None:
+        return await asyncio.to_thread(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+
+def shutdown_pools():
+    with _lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
@@ -0,0 +1,68 @@
+# Coordinate helpers: grid cells for indexed radius lookups and great-circle distance
+#
+# The globe is cut into CELL_DEGREES squares numbered row by row (latitude major),
+# so every latitude band of a search circle is one contiguous range of cell ids
+# and a radius query becomes a handful of BETWEENs on the indexed geo_cell column.
+
+import math
+from typing import List, Optional, Tuple
+
+CELL_DEGREES = 0.05  # ~5.5 km north-south
+CELLS_PER_ROW = round(360 / CELL_DEGREES)
+CELL_ROWS = round(180 / CELL_DEGREES)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+def valid_coordinates(lat: Optional[float], lon: Optional[float]) -> bool:
+    return lat is not None and lon is not None and -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def _row(lat: float) -> int:
+    return min(int((lat + 90) // CELL_DEGREES), CELL_ROWS - 1)
+
+
+def _col(lon: float) -> int:
+    return min(int((lon + 180) // CELL_DEGREES), CELLS_PER_ROW - 1)
+
+
+def cell_for(lat: Optional[float], lon: Optional[float]) -> Optional[int]:
+    if not valid_coordinates(lat, lon):
+        return None
+    return _row(lat) * CELLS_PER_ROW + _col(lon)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+# (first, last) cell id ranges covering every point within radius_km of (lat, lon)
+def cell_ranges(lat: float, lon: float, radius_km: float) -> List[Tuple[int, int]]:
+    dlat = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+
+    # widest longitude span is at the band edge closest to a pole
+    cos_lat = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+    dlon = radius_km / (KM_PER_DEGREE * cos_lat) if cos_lat > 1e-6 else 360.0
+
+    if dlon >= 180:
+        spans = [(-180.0, 180.0)]
+    else:
+        west, east = lon - dlon, lon + dlon
+        # split the span where it crosses the antimeridian
+        if west < -180:
+            spans = [(west + 360, 180.0), (-180.0, east)]
+        elif east > 180:
+            spans = [(west, 180.0), (-180.0, east - 360)]
+        else:
+            spans = [(west, east)]
+
+    ranges = []
+    for row in range(_row(lat_min), _row(lat_max) + 1):
+        base = row * CELLS_PER_ROW
+        ranges.extend((base + _col(w), base + _col(e)) for w, e in spans)
+    return ranges
@@ -0,0 +1,111 @@
+# Image ingestion: validate, strip EXIF, downscale, re-encode and thumbnail
+
+import io
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+from app.core.executors import pool_size, run_in_pool, run_in_pool_async
+
+# formats accepted from phones/browsers
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF", "MPO"}
+
+OUTPUT_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg"}
+
+# largest image decoded; Pillow itself only raises at twice MAX_IMAGE_PIXELS
+# (and just warns above it), so the limit is checked from the header below
+MAX_PIXELS = 64_000_000
+Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+
+
+class InvalidImageError(ValueError):
+    pass
+
+
+# format and size from the header, before anything is decoded
+def _check_header(img: Image.Image) -> None:
+    if img.format not in ALLOWED_FORMATS:
+        raise InvalidImageError(f"Unsupported image type: {img.format}")
+    if img.width * img.height > MAX_PIXELS:
+        raise InvalidImageError(f"Image exceeds {MAX_PIXELS} pixels")
+
+
+@dataclass
+class ProcessedImage:
+    data: bytes
+    content_type: str
+    thumbnail: Optional[bytes] = None
+
+
+def _encode(img: Image.Image, fmt: str, quality: int) -> bytes:
+    out = io.BytesIO()
+    # no exif/icc arguments, so metadata (GPS, device) is dropped
+    img.save(out, format=fmt, quality=quality, optimize=True)
+    return out.getvalue()
+
+
+def process_image(
+    data: bytes,
+    max_dimension: int,
+    thumbnail_dimension: int,
+    fmt: str,
+    quality: int,
+    with_thumbnail: bool = True,
+) -> ProcessedImage:
+    try:
+        img = Image.open(io.BytesIO(data))
+        _check_header(img)
+
+        # apply the EXIF orientation before the EXIF block is discarded
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if fmt == "WEBP" and img.mode in ("RGBA", "LA", "P") else "RGB")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImageError("Photo must be a JPEG, PNG, WEBP or GIF image") from e
+
+    img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    processed = ProcessedImage(_encode(img, fmt, quality), OUTPUT_TYPES[fmt])
+
+    if with_thumbnail:
+        img.thumbnail((thumbnail_dimension, thumbnail_dimension), Image.Resampling.LANCZOS)
+        processed.thumbnail = _encode(img, fmt, quality)
+
+    return processed
+
+
+# cheap format and size check from the image header (no decoding), for rejecting bad
+# uploads in the request before the real work is queued. Reads only the header
+# of a stream and rewinds it
+def check_image(stream: BinaryIO) -> None:
+    try:
+        with Image.open(stream) as img:
+            _check_header(img)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImageError("Photo must be a JPEG, PNG, WEBP or GIF image") from e
+    finally:
+        stream.seek(0)
+
+
+def _args(data: bytes, with_thumbnail: bool) -> tuple:
+    return (
+        data,
+        settings.IMAGE_MAX_DIMENSION,
+        settings.IMAGE_THUMBNAIL_DIMENSION,
+        settings.IMAGE_FORMAT.upper(),
+        settings.IMAGE_QUALITY,
+        with_thumbnail,
+    )
+
+
+# run in the "images" process pool (inline when IMAGE_WORKERS is 0)
+def ingest_image(data: bytes, with_thumbnail: bool = True) -> ProcessedImage:
+    return run_in_pool(
+        "images", pool_size(settings.IMAGE_WORKERS), process_image, *_args(data, with_thumbnail)
+    )
+
+
+async def ingest_image_async(data: bytes, with_thumbnail: bool = True) -> ProcessedImage:
+    return await run_in_pool_async(
+        "images", pool_size(settings.IMAGE_WORKERS), process_image, *_args(data, with_thumbnail)
+    )
@@ -0,0 +1,526 @@
+# Background jobs: slow post-submit work (photo processing, AI analysis,
+# notifications) runs after the response is sent, with retries and backoff
+#
+# Handlers are plain functions registered with @handler(name) and called in a
+# thread with the job's JSON payload as keyword arguments. Jobs are kept by a
+# backend: "database" (jobs table, survives restarts and is visible to every
+# worker) or "memory" (this process only). JOBS_WORKERS asyncio tasks per
+# process, started from the app lifespan, claim and run due jobs; with no
+# workers running (serverless, JOBS_WORKERS=0) a job runs inline on enqueue.
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+
+from app.core.cache import TTLCache
+from app.core import metrics
+from app.core.config import settings
+from app.db.session import SessionLocal, get_engine
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# extra time a running job's lease gets beyond its timeout before another
+# worker may take it over
+LEASE_GRACE_SECONDS = 30
+
+
+# raise from a handler when retrying can't help (bad input, missing data)
+class PermanentJobError(Exception):
+    pass
+
+
+@dataclass
+class JobHandler:
+    fn: Callable
+    max_attempts: int
+    timeout: float
+    # called with the payload once the job has failed for good
+    on_failure: Optional[Callable] = None
+
+
+HANDLERS: Dict[str, JobHandler] = {}
+
+
+def handler(
+    name: str,
+    max_attempts: Optional[int] = None,
+    timeout: Optional[float] = None,
+    on_failure: Optional[Callable] = None,
+):
+    def register(fn: Callable) -> Callable:
+        HANDLERS[name] = JobHandler(
+            fn,
+            max_attempts or settings.JOBS_MAX_ATTEMPTS,
+            timeout or settings.JOBS_TIMEOUT_SECONDS,
+            on_failure,
+        )
+        return fn
+    return register
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# SQLite hands timestamps back without a timezone, they are always UTC
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass
+class JobRecord:
+    id: str
+    name: str
+    payload: dict
+    max_attempts: int
+    owner_id: Optional[int] = None
+    status: str = JobStatus.queued.value
+    attempts: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=utcnow)
+    run_at: datetime = field(default_factory=utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    lease_expires_at: Optional[datetime] = None
+    queue_ms: Optional[float] = None
+    duration_ms: Optional[float] = None
+
+
+def _lease(job: JobRecord, now: datetime) -> datetime:
+    timeout = HANDLERS[job.name].timeout if job.name in HANDLERS else settings.JOBS_TIMEOUT_SECONDS
+    return now + timedelta(seconds=timeout + LEASE_GRACE_SECONDS)
+
+
+# mark a claimed job as running (time in queue counts from when it was due)
+def _start(job: JobRecord, now: datetime) -> None:
+    job.status = JobStatus.running.value
+    job.attempts += 1
+    job.started_at = now
+    job.lease_expires_at = _lease(job, now)
+    job.queue_ms = max((now - as_utc(job.run_at)).total_seconds() * 1000, 0.0)
+
+
+class MemoryJobBackend:
+    def __init__(self):
+        self._active: Dict[str, JobRecord] = {}
+        # finished jobs stay readable for JOBS_RESULT_TTL_SECONDS
+        self._finished = TTLCache(ttl=settings.JOBS_RESULT_TTL_SECONDS, maxsize=10_000)
+        self._lock = threading.Lock()
+
+    def prepare(self) -> None:
+        pass
+
+    def add(self, job: JobRecord) -> None:
+        with self._lock:
+            self._active[job.id] = job
+
+    def claim(self, now: datetime) -> Optional[JobRecord]:
+        with self._lock:
+            due = [
+                j for j in self._active.values()
+                if j.status == JobStatus.queued.value and j.run_at <= now
+            ]
+            if not due:
+                return None
+            job = min(due, key=lambda j: j.run_at)
+            _start(job, now)
+            return job
+
+    def save(self, job: JobRecord) -> None:
+        if job.status in (JobStatus.succeeded.value, JobStatus.failed.value):
+            with self._lock:
+                self._active.pop(job.id, None)
+            self._finished.set(job.id, job)
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        with self._lock:
+            job = self._active.get(job_id)
+        return job or self._finished.get(job_id)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+    def prune(self, before: datetime) -> None:
+        pass
+
+
+class DatabaseJobBackend:
+    def __init__(self):
+        self._prepared = False
+        self._lock = threading.Lock()
+
+    # jobs table on first use (app.db.migrate creates it too)
+    def prepare(self) -> None:
+        if self._prepared:
+            return
+        with self._lock:
+            if not self._prepared:
+                Job.__table__.create(bind=get_engine(), checkfirst=True)
+                self._prepared = True
+
+    @staticmethod
+    def _record(row) -> JobRecord:
+        return JobRecord(
+            id=row.id,
+            name=row.name,
+            payload=json.loads(row.payload),
+            max_attempts=row.max_attempts,
+            owner_id=row.owner_id,
+            status=row.status,
+            attempts=row.attempts,
+            result=json.loads(row.result) if row.result is not None else None,
+            error=row.error,
+            created_at=as_utc(row.created_at),
+            run_at=as_utc(row.run_at),
+            started_at=as_utc(row.started_at),
+            finished_at=as_utc(row.finished_at),
+            lease_expires_at=as_utc(row.lease_expires_at),
+            queue_ms=row.queue_ms,
+            duration_ms=row.duration_ms,
+        )
+
+    def add(self, job: JobRecord) -> None:
+        with SessionLocal() as db:
+            db.add(Job(
+                id=job.id,
+                name=job.name,
+                payload=json.dumps(job.payload),
+                status=job.status,
+                attempts=job.attempts,
+                max_attempts=job.max_attempts,
+                owner_id=job.owner_id,
+                created_at=job.created_at,
+                run_at=job.run_at,
+                started_at=job.started_at,
+                lease_expires_at=job.lease_expires_at,
+                queue_ms=job.queue_ms,
+            ))
+            db.commit()
+
+    # oldest due job, or a running one whose worker went away. SKIP LOCKED keeps
+    # PostgreSQL workers off each other's rows; the conditional UPDATE is what
+    # makes the claim safe everywhere else
+    def claim(self, now: datetime) -> Optional[JobRecord]:
+        due = or_(
+            and_(Job.status == JobStatus.queued.value, Job.run_at <= now),
+            and_(Job.status == JobStatus.running.value, Job.lease_expires_at < now),
+        )
+        with SessionLocal() as db:
+            for _ in range(3):
+                row = db.execute(
+                    select(Job).where(due).order_by(Job.run_at).limit(1).with_for_update(skip_locked=True)
+                ).scalar()
+                if row is None:
+                    return None
+                job = self._record(row)
+                _start(job, now)
+                claimed = db.execute(
+                    update(Job)
+                    .where(Job.id == job.id, due)
+                    .values(
+                        status=job.status,
+                        attempts=Job.attempts + 1,
+                        started_at=job.started_at,
+                        lease_expires_at=job.lease_expires_at,
+                        queue_ms=job.queue_ms,
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                if claimed:
+                    return job
+                db.expunge_all()
+        return None
+
+    def save(self, job: JobRecord) -> None:
+        with SessionLocal() as db:
+            db.execute(
+                update(Job)
+                .where(Job.id == job.id)
+                .values(
+                    status=job.status,
+                    result=json.dumps(job.result) if job.result is not None else None,
+                    error=job.error,
+                    run_at=job.run_at,
+                    finished_at=job.finished_at,
+                    lease_expires_at=job.lease_expires_at,
+                    duration_ms=job.duration_ms,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        with SessionLocal() as db:
+            row = db.get(Job, job_id)
+            return self._record(row) if row else None
+
+    def pending(self) -> int:
+        with SessionLocal() as db:
+            return db.scalar(select(func.count()).select_from(Job).where(
+                Job.status.in_([JobStatus.queued.value, JobStatus.running.value])
+            ))
+
+    def prune(self, before: datetime) -> None:
+        with SessionLocal() as db:
+            db.execute(delete(Job).where(
+                Job.status.in_([JobStatus.succeeded.value, JobStatus.failed.value]),
+                Job.finished_at < before,
+            ))
+            db.commit()
+
+
+@lru_cache
+def get_backend():
+    if settings.JOBS_BACKEND == "memory":
+        return MemoryJobBackend()
+    return DatabaseJobBackend()
+
+
+# per job name outcome counters and timings (this process)
+_stats: Dict[str, Dict[str, float]] = defaultdict(
+    lambda: {"succeeded": 0, "retried": 0, "failed": 0, "run_ms": 0.0, "max_run_ms": 0.0, "queue_ms": 0.0}
+)
+_stats_lock = threading.Lock()
+
+
+def _record_stats(job: JobRecord) -> None:
+    outcome = "retried" if job.status == JobStatus.queued.value else job.status
+    with _stats_lock:
+        s = _stats[job.name]
+        s[outcome] += 1
+        s["run_ms"] += job.duration_ms or 0.0
+        s["max_run_ms"] = max(s["max_run_ms"], job.duration_ms or 0.0)
+        s["queue_ms"] += job.queue_ms or 0.0
+    metrics.observe_job(job.name, outcome, (job.duration_ms or 0.0) / 1000, (job.queue_ms or 0.0) / 1000)
+
+
+def stats() -> dict:
+    with _stats_lock:
+        result = {}
+        for name, s in _stats.items():
+            attempts = s["succeeded"] + s["retried"] + s["failed"]
+            result[name] = {
+                "succeeded": s["succeeded"],
+                "retried": s["retried"],
+                "failed": s["failed"],
+                "avg_run_ms": round(s["run_ms"] / attempts, 2) if attempts else 0.0,
+                "max_run_ms": round(s["max_run_ms"], 2),
+                "avg_queue_ms": round(s["queue_ms"] / attempts, 2) if attempts else 0.0,
+            }
+        return result
+
+
+# exponential backoff with jitter: ~base, 2*base, 4*base ... capped
+def backoff(attempts: int) -> float:
+    delay = settings.JOBS_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+    return min(delay, settings.JOBS_RETRY_BACKOFF_MAX_SECONDS) * random.uniform(0.5, 1.5)
+
+
+def _call(job: JobRecord):
+    job_handler = HANDLERS.get(job.name)
+    if job_handler is None:
+        raise PermanentJobError(f"No handler for job {job.name!r}")
+    return job_handler.fn(**job.payload)
+
+
+# record the outcome of an attempt: done, failed for good or queued again
+def _settle(backend, job: JobRecord, result=None, error: Optional[BaseException] = None) -> None:
+    now = utcnow()
+    job.lease_expires_at = None
+
+    if error is None:
+        job.status, job.result, job.error = JobStatus.succeeded.value, result, None
+        job.finished_at = now
+    else:
+        job.error = str(error) or type(error).__name__
+        final = isinstance(error, PermanentJobError) or job.attempts >= job.max_attempts
+        if final:
+            job.status, job.finished_at = JobStatus.failed.value, now
+            logger.warning("job %s (%s) failed: %s", job.id, job.name, job.error)
+        else:
+            job.status = JobStatus.queued.value
+            job.run_at = now + timedelta(seconds=backoff(job.attempts))
+
+    backend.save(job)
+    _record_stats(job)
+
+    job_handler = HANDLERS.get(job.name)
+    if job.status == JobStatus.failed.value and job_handler and job_handler.on_failure:
+        try:
+            job_handler.on_failure(**job.payload)
+        except Exception:
+            logger.exception("on_failure of job %s (%s) failed", job.id, job.name)
+
+
+# no workers: one attempt while the caller waits. A failed attempt is queued
+# again with backoff like any other, for a later enqueue or a worker to claim
+def _run_inline(backend, job: JobRecord) -> None:
+    start = time.perf_counter()
+    try:
+        result, error = _call(job), None
+    except Exception as e:
+        result, error = None, e
+    job.duration_ms = (time.perf_counter() - start) * 1000
+    _settle(backend, job, result, error)
+
+
+class JobRunner:
+    def __init__(self):
+        self.tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._pruned_at = float("-inf")  # first prune on the first pass, then once per TTL
+
+    @property
+    def running(self) -> bool:
+        return bool(self.tasks)
+
+    async def start(self, workers: int) -> None:
+        if workers <= 0 or self.tasks:
+            return
+        await asyncio.to_thread(get_backend().prepare)
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.tasks = [asyncio.create_task(self._work()) for _ in range(workers)]
+
+    async def stop(self) -> None:
+        tasks, self.tasks = self.tasks, []
+        for task in tasks:
+            task.cancel()
+        # jobs cut off here keep their lease and are picked up again once it expires
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+
+    # safe from any thread: idle workers look for new jobs now instead of at the next poll
+    def wake(self) -> None:
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:  # loop already closed
+                pass
+
+    async def _work(self) -> None:
+        backend = get_backend()
+        while True:
+            try:
+                await self._prune(backend)
+                job = await asyncio.to_thread(backend.claim, utcnow())
+            except Exception:
+                logger.exception("claiming a job failed")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.JOBS_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            await self._run(backend, job)
+
+    # a sync handler that times out can't be interrupted, its thread runs on
+    # but the attempt counts as failed
+    async def _run(self, backend, job: JobRecord) -> None:
+        job_handler = HANDLERS.get(job.name)
+        timeout = job_handler.timeout if job_handler else settings.JOBS_TIMEOUT_SECONDS
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.to_thread(_call, job), timeout)
+            error = None
+        except asyncio.TimeoutError:
+            result, error = None, TimeoutError(f"Job timed out after {timeout}s")
+        except Exception as e:
+            result, error = None, e
+        job.duration_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            await asyncio.to_thread(_settle, backend, job, result, error)
+        except Exception:
+            logger.exception("recording job %s (%s) failed", job.id, job.name)
+
+    # drop finished jobs older than JOBS_RESULT_TTL_SECONDS now and then
+    async def _prune(self, backend) -> None:
+        if time.monotonic() - self._pruned_at < settings.JOBS_RESULT_TTL_SECONDS:
+            return
+        self._pruned_at = time.monotonic()
+        before = utcnow() - timedelta(seconds=settings.JOBS_RESULT_TTL_SECONDS)
+        await asyncio.to_thread(backend.prune, before)
+
+
+runner = JobRunner()
+
+
+# None (setting unset) -> 4 workers, none on serverless where nothing runs
+# after the response is sent
+def worker_count() -> int:
+    if settings.JOBS_WORKERS is not None:
+        return settings.JOBS_WORKERS
+    return 0 if settings.is_serverless else 4
+
+
+# queue a job (thread safe, blocking: call sync code from the threadpool)
+def enqueue(name: str, payload: dict, owner_id: Optional[int] = None) -> JobRecord:
+    job_handler = HANDLERS[name]
+    now = utcnow()
+    job = JobRecord(
+        id=uuid.uuid4().hex,
+        name=name,
+        payload=json.loads(json.dumps(payload)),  # what the database backend would hand back
+        max_attempts=job_handler.max_attempts,
+        owner_id=owner_id,
+        created_at=now,
+        run_at=now,
+    )
+    backend = get_backend()
+
+    if runner.running:
+        backend.add(job)
+        runner.wake()
+        return job
+
+    backend.prepare()
+    _start(job, now)
+    backend.add(job)
+    _run_inline(backend, job)
+
+    # retries only make progress when something claims them: take one that is due
+    retry = backend.claim(utcnow())
+    if retry is not None:
+        _run_inline(backend, retry)
+    return job
+
+
+def get_job(job_id: str) -> Optional[JobRecord]:
+    return get_backend().get(job_id)
+
+
+# queued or running jobs
+def pending() -> int:
+    return get_backend().pending()
+
+
+async def start() -> None:
+    await runner.start(worker_count())
+
+
+async def stop() -> None:
+    await runner.stop()
@@ -0,0 +1,309 @@
+# Request metrics in Prometheus text format (GET /metrics)
+#
+# MetricsMiddleware times every request and records its sizes and status plus
+# the database and AI work done for it. The per-request counters live in a
+# contextvar, which the threadpool (sync routes) and asyncio.to_thread copy, so
+# SQLAlchemy cursor events and AI calls are charged to the request they ran for.
+# Everything is per process: scrape each worker.
+
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+AI_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30)
+JOB_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, values)} {_number(total)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per bucket counts (+Inf last), sum]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += count
+                    le = f'le="{bound if bound == "+Inf" else _number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labels, values)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests", ("method", "route", "status"))
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"), LATENCY_BUCKETS
+)
+REQUEST_SIZE = Histogram(
+    "http_request_size_bytes", "HTTP request body size", ("method", "route"), SIZE_BUCKETS
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "HTTP response body size", ("method", "route"), SIZE_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request", ("route",), COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    "db_time_per_request_seconds", "Time in SQL statements per HTTP request", ("route",), LATENCY_BUCKETS
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement latency", ("route",), QUERY_BUCKETS
+)
+AI_DURATION = Histogram(
+    "ai_call_duration_seconds", "Gemini image analysis latency", ("outcome",), AI_BUCKETS
+)
+JOB_DURATION = Histogram(
+    "job_run_duration_seconds", "Background job attempt latency", ("name", "outcome"), JOB_BUCKETS
+)
+JOB_QUEUE_TIME = Histogram(
+    "job_queue_duration_seconds", "Time a background job waited for a worker", ("name",), JOB_BUCKETS
+)
+
+METRICS = [
+    REQUESTS, REQUEST_DURATION, REQUEST_SIZE, RESPONSE_SIZE, REQUEST_QUERIES,
+    REQUEST_DB_TIME, QUERY_DURATION, AI_DURATION, JOB_DURATION, JOB_QUEUE_TIME,
+]
+
+
+# work done for the request being served
+class RequestMetrics:
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self._route: Optional[str] = None
+        self.start = time.perf_counter()
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.ai_calls = 0
+        self.ai_seconds = 0.0
+
+    # route template ("/reports/{id}"), known once the router has matched.
+    # Rebuilt from the path and its parameters: included routes keep the path
+    # without the router prefix
+    @property
+    def route(self) -> str:
+        if self._route is None:
+            if "route" not in self.scope:
+                return "<unmatched>"
+            segments = self.scope["path"].split("/")
+            for name, value in self.scope.get("path_params", {}).items():
+                if str(value) in segments:
+                    segments[segments.index(str(value))] = "{" + name + "}"
+            self._route = "/".join(segments)
+        return self._route
+
+    def server_timing(self) -> str:
+        total = (time.perf_counter() - self.start) * 1000
+        return (
+            f"app;dur={total:.1f}, "
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries", '
+            f'ai;dur={self.ai_seconds * 1000:.1f};desc="{self.ai_calls} calls"'
+        )
+
+
+current_request: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+
+def observe_query(seconds: float) -> None:
+    request = current_request.get()
+    route = request.route if request else "<background>"
+    QUERY_DURATION.observe(seconds, route)
+    if request:
+        request.db_queries += 1
+        request.db_seconds += seconds
+
+
+def observe_ai(outcome: str, seconds: float) -> None:
+    AI_DURATION.observe(seconds, outcome)
+    request = current_request.get()
+    if request:
+        request.ai_calls += 1
+        request.ai_seconds += seconds
+
+
+def observe_job(name: str, outcome: str, run_seconds: float, queue_seconds: float) -> None:
+    JOB_DURATION.observe(run_seconds, name, outcome)
+    JOB_QUEUE_TIME.observe(queue_seconds, name)
+
+
+# types of bound parameters, never their values (they may be personal data)
+def parameters_shape(parameters, executemany: bool = False, limit: int = 20) -> str:
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} x {parameters_shape(rows[0])}" if rows else "[]"
+    if isinstance(parameters, dict):
+        items = [f"{k}: {type(v).__name__}" for k, v in parameters.items()]
+        opening, closing = "{", "}"
+    elif isinstance(parameters, (list, tuple)):
+        items = [type(v).__name__ for v in parameters]
+        opening, closing = "(", ")"
+    else:
+        return "none" if parameters is None else type(parameters).__name__
+    if len(items) > limit:
+        items = items[:limit] + [f"... {len(items) - limit} more"]
+    return opening + ", ".join(items) + closing
+
+
+def log_slow_query(statement: str, parameters, executemany: bool, seconds: float) -> None:
+    request = current_request.get()
+    origin = f"{request.scope['method']} {request.route}" if request else "<background>"
+    slow_query_logger.warning(
+        "slow query %.1f ms [%s] params=%s sql=%s",
+        seconds * 1000,
+        origin,
+        parameters_shape(parameters, executemany),
+        " ".join(statement.split())[:2000],
+    )
+
+
+# statement timings for every engine (engine may be the sync_engine of an AsyncEngine)
+def instrument_queries(engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_start"].pop()
+        observe_query(seconds)
+        if settings.SLOW_QUERY_MS and seconds * 1000 >= settings.SLOW_QUERY_MS:
+            log_slow_query(statement, parameters, executemany, seconds)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        starts = context.connection.info.get("query_start") if context.connection else None
+        if starts:
+            observe_query(time.perf_counter() - starts.pop())
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestMetrics(scope)
+        token = current_request.set(request)
+        status = 500
+
+        async def receive_counted():
+            message = await receive()
+            if message["type"] == "http.request":
+                request.request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_counted(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.METRICS_SERVER_TIMING:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", request.server_timing().encode()),
+                    ]
+            elif message["type"] == "http.response.body":
+                request.response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_counted, send_counted)
+        finally:
+            current_request.reset(token)
+            method, route = scope["method"], request.route
+            REQUESTS.inc(method, route, str(status))
+            REQUEST_DURATION.observe(time.perf_counter() - request.start, method, route)
+            REQUEST_SIZE.observe(request.request_bytes, method, route)
+            RESPONSE_SIZE.observe(request.response_bytes, method, route)
+            REQUEST_QUERIES.observe(request.db_queries, route)
+            REQUEST_DB_TIME.observe(request.db_seconds, route)
+
+
+def _gauges(name: str, help: str, samples: Iterable[Tuple[dict, float]]) -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}")
+    return lines
+
+
+# pools: {"sync": pool_stats(engine), ...} from app.db.pool
+def render(pools: Optional[Dict[str, dict]] = None) -> str:
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+
+    for key in ("checked_out", "checked_in", "overflow", "size", "connects", "checkouts",
+                "wait_count", "wait_seconds_total", "wait_seconds_max"):
+        samples = [({"engine": name}, stats[key]) for name, stats in (pools or {}).items() if key in stats]
+        if samples:
+            lines.extend(_gauges(f"db_pool_{key}", f"Connection pool {key.replace('_', ' ')}", samples))
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,172 @@
+# On-demand request profiling for admins (?profile=1 or "X-Profile: 1")
+#
+# A sampler thread snapshots the stacks of every thread (sys._current_frames)
+# every PROFILER_INTERVAL_MS while the request runs. Sync routes execute in the
+# threadpool, so sampling only the event loop thread would miss them; stacks
+# that never enter the app package (idle workers, the event loop waiting) are
+# dropped. Other requests served by the same worker at the same time show up
+# too, profile on a quiet worker for a clean report.
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from app.core import metrics
+from app.core.config import settings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# functions below this share of the samples are left out of the report
+MIN_SHARE = 0.005
+
+Frame = Tuple[str, str, int]  # function, file, first line
+
+
+def _short(filename: str) -> str:
+    for root in sorted((p for p in sys.path if p), key=len, reverse=True):
+        if filename.startswith(root + os.sep):
+            return filename[len(root) + 1:]
+    return filename
+
+
+class StackSampler:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.rounds = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.rounds += 1
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    stack = self._stack(frame)
+                    if stack:
+                        self.stacks[stack] += 1
+
+    # outermost call first; None when no frame belongs to the app
+    @staticmethod
+    def _stack(frame) -> Optional[Tuple[Frame, ...]]:
+        stack, in_app = [], False
+        while frame is not None:
+            code = frame.f_code
+            in_app = in_app or (code.co_filename.startswith(APP_DIR) and code.co_filename != __file__)
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        return tuple(reversed(stack)) if in_app else None
+
+    # call tree: share of sample rounds and wall-clock milliseconds per function
+    def report(self) -> List[str]:
+        tree: Dict = {}
+        for stack, count in self.stacks.items():
+            node = tree
+            for frame in stack:
+                entry = node.setdefault(frame, [0, {}])
+                entry[0] += count
+                node = entry[1]
+
+        lines = []
+        total = max(self.rounds, 1)
+
+        def walk(node: Dict, depth: int) -> None:
+            for (name, filename, line), (count, children) in sorted(
+                node.items(), key=lambda item: -item[1][0]
+            ):
+                if count / total < MIN_SHARE:
+                    continue
+                lines.append(
+                    f"{count / total:7.1%} {count * self.interval * 1000:8.1f} ms  "
+                    f"{'  ' * depth}{name}  {_short(filename)}:{line}"
+                )
+                walk(children, depth + 1)
+
+        walk(tree, 0)
+        return lines
+
+
+def wants_profile(scope) -> bool:
+    headers = dict(scope.get("headers") or [])
+    if headers.get(b"x-profile", b"").strip() in (b"1", b"true"):
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("profile", [""])[-1] in ("1", "true")
+
+
+# only admins may profile; the role comes from the user record, not the token
+async def is_admin(scope) -> bool:
+    from app.dependencies import principal_for_token
+    from app.models.user import UserRole
+
+    authorization = dict(scope.get("headers") or []).get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        principal = await asyncio.to_thread(principal_for_token, token)
+    except Exception:
+        return False
+    return principal.role == UserRole.admin
+
+
+class ProfilerMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not wants_profile(scope) or not await is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        # the response is swallowed, the report is sent instead
+        async def capture(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        sampler = StackSampler(settings.PROFILER_INTERVAL_MS / 1000)
+        sampler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            sampler.stop()
+
+        lines = [
+            f"{scope['method']} {scope['path']} -> {status} in {sampler.elapsed * 1000:.1f} ms "
+            f"({sampler.rounds} samples every {settings.PROFILER_INTERVAL_MS:g} ms, all threads)",
+        ]
+        request = metrics.current_request.get()
+        if request:
+            lines.append(f"SQL: {request.db_queries} statements, {request.db_seconds * 1000:.1f} ms")
+        lines.append("")
+        lines.extend(sampler.report())
+
+        body = ("\n".join(lines) + "\n").encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,28 +1,75 @@
 from datetime import datetime, timedelta
-from jose import jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, Tuple
 from app.core.config import settings
+from app.core.executors import pool_size, run_in_pool, run_in_pool_async
 
 
-# password hashing setup
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# password hashing setup; hashes with other rounds are upgraded on login.
+# Built on first use (in the pool process), passlib is not needed to serve tokens
+@lru_cache(maxsize=None)
+def pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        deprecated="auto",
+        pbkdf2_sha256__rounds=settings.PASSWORD_HASH_ROUNDS,
+    )
+
+
+# these run inside the "passwords" process pool
+def _hash(password: str) -> str:
+    return pwd_context().hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context().verify_and_update(password, hashed_password)
+
+
+# at most PASSWORD_HASH_WORKERS hashes run at once, further calls queue for a process
+def _workers() -> int:
+    return pool_size(settings.PASSWORD_HASH_WORKERS)
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return run_in_pool("passwords", _workers(), _hash, password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+    return verify_and_update(password, hashed_password)[0]
+
 
+# (valid, new hash or None); a new hash means the stored one uses outdated parameters
+def verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return run_in_pool("passwords", _workers(), _verify_and_update, password, hashed_password)
 
-def create_access_token(subject: str) -> str:
+
+async def hash_password_async(password: str) -> str:
+    return await run_in_pool_async("passwords", _workers(), _hash, password)
+
+
+async def verify_and_update_async(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await run_in_pool_async(
+        "passwords", _workers(), _verify_and_update, password, hashed_password
+    )
+
+
+# the uid claim lets get_current_user trust a cached principal for this subject;
+# the role always comes from that principal, so role changes apply within the cache TTL
+def create_access_token(subject: str, user_id: Optional[int] = None) -> str:
     expire = datetime.utcnow() + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
 
+    claims = {"sub": subject, "exp": expire}
+    if user_id is not None:
+        claims["uid"] = user_id
+
+    from jose import jwt
+
     return jwt.encode(
-        {"sub": subject, "exp": expire},
+        claims,
         settings.SECRET_KEY,
         algorithm=settings.ALGORITHM
     )
\ No newline at end of file
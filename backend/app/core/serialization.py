@@ -0,0 +1,53 @@
+# Fast JSON for list responses
+#
+# FastAPI validates a route's return value against its response_model before
+# serializing it; for pages of ORM rows that validation is most of the cost
+# (~11 ms per 1000 reports). List routes instead read the schema's fields
+# straight off the rows and encode them with orjson, returning the response
+# themselves. Their response_model still documents the shape in OpenAPI.
+
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Iterable, List, Optional, Tuple, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+# UTC datetimes end in "Z", like pydantic's serializer
+OPTIONS = orjson.OPT_UTC_Z
+
+
+def _default(value: Any):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=OPTIONS)
+
+
+@lru_cache(maxsize=None)
+def _reader(schema: Type[BaseModel]) -> Tuple[Tuple[str, ...], attrgetter]:
+    fields = tuple(schema.model_fields)
+    return fields, attrgetter(*fields)
+
+
+# the schema's fields of every row as plain dicts, without validation: the rows
+# come from the database in the shape the schema describes
+def rows_as_dicts(schema: Type[BaseModel], rows: Iterable) -> List[dict]:
+    fields, read = _reader(schema)
+    return [dict(zip(fields, read(row))) for row in rows]
+
+
+# headers set on the route's `response` (ETag, Cache-Control) are only copied by
+# FastAPI onto responses it builds itself
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    out = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        out.headers.raw.extend(response.headers.raw)
+    return out
@@ -1,3 +1,4 @@
 from app.db.session import Base  # noqa
 from app.models.user import User  # noqa
 from app.models.report import Report  # noqa
+from app.models.job import Job  # noqa
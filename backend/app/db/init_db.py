@@ -1,7 +1,9 @@
+from collections import defaultdict
 from sqlalchemy.orm import Session
 from app.core.security import hash_password
 from app.models.user import User, UserRole
-from app.models.report import Report
+from app.models.report import Report, ReportStatus
+from app.services import assignment
 
 
 def get_user_by_email(db: Session, email: str):
@@ -27,12 +29,35 @@ def get_or_create_user(db: Session, full_name: str, email: str, password: str, r
     return user or create_user(db, full_name, email, password, role, phone)  # Reuse existing user if found
 
 
-def assign_unassigned_reports(db: Session, team_id: int):
-    # Assign all reports without a team
-    db.query(Report).filter(Report.assigned_team_id == None).update(
-        {Report.assigned_team_id: team_id}
-    )
-    db.commit()
+def assign_unassigned_reports(db: Session, batch_size: int = 500):
+    # Spread open reports without a team over the rescue teams (same policy as new reports)
+    assignment.ensure_loaded(db)
+
+    while True:
+        rows = (
+            db.query(Report.id, Report.priority, Report.latitude, Report.longitude, Report.geo_cell)
+            .filter(Report.assigned_team_id == None, Report.status != ReportStatus.resolved.value)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        by_team = defaultdict(list)
+        for report_id, priority, lat, lon, cell in rows:
+            located = cell is not None
+            team_id = assignment.workload.pick(
+                priority, float(lat) if located else None, float(lon) if located else None
+            )
+            if team_id is None:
+                return
+            by_team[team_id].append(report_id)
+
+        for team_id, ids in by_team.items():
+            db.query(Report).filter(Report.id.in_(ids)).update(
+                {Report.assigned_team_id: team_id}, synchronize_session=False
+            )
+        db.commit()
 
 
 def init_db(db: Session):
@@ -41,9 +66,9 @@ def init_db(db: Session):
         UserRole.admin.value, "1234567890"
     )
 
-    team = get_or_create_user(
+    get_or_create_user(
         db, "Team Alpha", "team@kindsteps.com", "team123",
         UserRole.rescue_team.value, "0987654321"
     )
 
-    assign_unassigned_reports(db, team.id)
\ No newline at end of file
+    assign_unassigned_reports(db)
\ No newline at end of file
@@ -0,0 +1,175 @@
+# One-off schema/data migrations for existing databases
+# Run with: python -m app.db.migrate   (every step is safe to re-run)
+
+import base64
+import io
+import math
+
+from sqlalchemy import Float, String, inspect, text, type_coerce
+from sqlalchemy.orm import Session
+
+from app.core import geo
+from app.core.config import settings
+from app.db.session import SessionLocal, get_engine
+from app.models.job import Job
+from app.models.report import Report
+from app.services.photo_storage import get_photo_storage
+from app.services.search import ensure_search_index
+
+
+def add_column(conn, table: str, column: str, ddl: str):
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def add_photo_columns():
+    with get_engine().begin() as conn:
+        add_column(conn, "reports", "photo_key", "VARCHAR(64)")
+        add_column(conn, "reports", "photo_content_type", "VARCHAR")
+        add_column(conn, "reports", "thumbnail_key", "VARCHAR(64)")
+
+
+def create_index(name: str):
+    for index in Report.__table__.indexes:
+        if index.name == name:
+            index.create(bind=get_engine(), checkfirst=True)
+
+
+def add_list_index():
+    create_index("ix_reports_created_at_id")
+
+
+# latitude/longitude were free-form strings; non-numeric values become NULL
+def convert_coordinates():
+    with get_engine().begin() as conn:
+        add_column(conn, "reports", "geo_cell", "INTEGER")
+
+        # SQLite has no ALTER COLUMN TYPE, its values are cleaned by backfill_geo_cells
+        if conn.dialect.name == "postgresql":
+            types = {c["name"]: c["type"] for c in inspect(conn).get_columns("reports")}
+            for column in ("latitude", "longitude"):
+                if not isinstance(types[column], Float):
+                    conn.execute(text(
+                        f"ALTER TABLE reports ALTER COLUMN {column} TYPE DOUBLE PRECISION "
+                        f"USING CASE WHEN trim({column}) ~ '^[-+]?([0-9]+[.]?[0-9]*|[.][0-9]+)$' "
+                        f"THEN trim({column})::double precision END"
+                    ))
+
+    create_index("ix_reports_geo_cell")
+
+
+def parse_coordinate(value):
+    try:
+        number = float(str(value).strip())
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+# Store numeric coordinates and their grid cell for rows created before geo_cell existed
+def backfill_geo_cells(db: Session, batch_size: int = 500):
+    last_id = 0
+
+    while True:
+        rows = (
+            # read the raw values, legacy rows may hold any text
+            db.query(Report.id, type_coerce(Report.latitude, String), type_coerce(Report.longitude, String))
+            .filter(Report.id > last_id, Report.geo_cell.is_(None), Report.latitude.isnot(None))
+            .order_by(Report.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        for report_id, raw_lat, raw_lon in rows:
+            lat, lon = parse_coordinate(raw_lat), parse_coordinate(raw_lon)
+            if not geo.valid_coordinates(lat, lon):
+                lat = lon = None
+
+            db.query(Report).filter(Report.id == report_id).update(
+                {
+                    Report.latitude: lat,
+                    Report.longitude: lon,
+                    Report.geo_cell: geo.cell_for(lat, lon),
+                },
+                synchronize_session=False,
+            )
+
+        last_id = rows[-1][0]
+        db.commit()
+
+
+# tsvector column + GIN index (PostgreSQL, rewrites the table once) or FTS5 table (SQLite)
+def add_search_index():
+    with get_engine().begin() as conn:
+        ensure_search_index(conn)
+
+
+def add_postgis_index():
+    if settings.GEO_INDEX != "postgis":
+        return
+    with get_engine().begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_reports_geography ON reports "
+            "USING gist (geography(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)))"
+        ))
+
+
+def create_jobs_table():
+    Job.__table__.create(bind=get_engine(), checkfirst=True)
+
+
+# Move inline base64 photos out of reports.photo_url into the photo store
+def move_inline_photos(db: Session, batch_size: int = 50):
+    storage = get_photo_storage()
+
+    while True:
+        rows = (
+            db.query(Report.id, Report.photo_url)
+            .filter(Report.photo_url.isnot(None), Report.photo_key.is_(None))
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        for report_id, photo_b64 in rows:
+            content_type = "image/jpeg"
+            if photo_b64.startswith("data:"):
+                header, _, photo_b64 = photo_b64.partition(",")
+                content_type = header[5:].split(";")[0] or content_type
+
+            stored = storage.save(io.BytesIO(base64.b64decode(photo_b64)))
+            db.query(Report).filter(Report.id == report_id).update(
+                {
+                    Report.photo_key: stored.key,
+                    Report.photo_content_type: content_type,
+                    Report.photo_url: None,
+                },
+                synchronize_session=False,
+            )
+
+        db.commit()
+
+
+def run():
+    add_photo_columns()
+    add_list_index()
+    convert_coordinates()
+    add_postgis_index()
+    add_search_index()
+    create_jobs_table()
+
+    db = SessionLocal()
+    try:
+        move_inline_photos(db)
+        backfill_geo_cells(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,108 @@
+# Connection pool selection and checkout metrics
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+
+class PoolStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connects = 0  # new DBAPI connections (TCP + TLS + auth)
+        self.checkouts = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float):
+        with self.lock:
+            self.wait_count += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class _StatsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+# times how long callers wait to get a connection from the queue
+class _WaitTimingMixin(_StatsMixin):
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_StatsMixin, NullPool):
+    pass
+
+
+def pool_options(settings, is_async: bool = False) -> dict:
+    if settings.db_pool_mode == "null":
+        return {"poolclass": InstrumentedNullPool}
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+# engine may be a sync Engine or the sync_engine behind an AsyncEngine
+def instrument(engine):
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats = engine.pool.stats
+        with stats.lock:
+            stats.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats = engine.pool.stats
+        with stats.lock:
+            stats.checkouts += 1
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    stats = pool.stats
+    data = {
+        "mode": "queue" if isinstance(pool, QueuePool) else "null",
+        "connects": stats.connects,
+        "checkouts": stats.checkouts,
+        "wait_count": stats.wait_count,
+        "wait_seconds_total": round(stats.wait_seconds_total, 6),
+        "wait_seconds_max": round(stats.wait_seconds_max, 6),
+    }
+
+    if isinstance(pool, QueuePool):
+        data.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+
+    return data
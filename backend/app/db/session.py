@@ -1,25 +1,81 @@
+from functools import lru_cache
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.metrics import instrument_queries
+from app.db.pool import instrument, pool_options
+
+
+# Engines are built on first database use, not at import: a serverless cold
+# start that only serves /health or a cached principal never pays for the SSL
+# context, the dialect import or the pool
+
+
+def connect_args() -> dict:
+    args = {}
+    # Add SSL context if connecting to remote Supabase/postgres with pg8000
+    if "supabase" in settings.SQLALCHEMY_DATABASE_URI and "pg8000" in settings.SQLALCHEMY_DATABASE_URI:
+        import ssl
 
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE  # Prevent cert verification errors on serverless
+        args["ssl_context"] = context
+    return args
 
-import ssl
-from sqlalchemy.pool import NullPool
 
-# create database engine
-connect_args = {}
-# Add SSL context if connecting to remote Supabase/postgres with pg8000
-if "supabase" in settings.SQLALCHEMY_DATABASE_URI and "pg8000" in settings.SQLALCHEMY_DATABASE_URI:
-    context = ssl.create_default_context()
-    context.check_hostname = False
-    context.verify_mode = ssl.CERT_NONE  # Prevent cert verification errors on serverless
-    connect_args["ssl_context"] = context
+# create database engine (once per process)
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    engine = create_engine(
+        settings.SQLALCHEMY_DATABASE_URI, connect_args=connect_args(), **pool_options(settings)
+    )
+    instrument(engine)
+    instrument_queries(engine)
+    return engine
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, connect_args=connect_args, poolclass=NullPool)
+
+# without building it: status endpoints report on an engine only once it is in use
+def engine_created() -> bool:
+    return get_engine.cache_info().currsize > 0
+
+
+# sessions without an explicit bind use the engine, built when the first statement runs
+class LazySession(Session):
+    def get_bind(self, *args, **kwargs):
+        if self.bind is None:
+            self.bind = get_engine()
+        return super().get_bind(*args, **kwargs)
 
 
 # create session factory
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+SessionLocal = sessionmaker(class_=LazySession, autocommit=False, autoflush=False)
+
+
+# async engine, only used when DB_ASYNC is enabled
+@lru_cache(maxsize=None)
+def get_async_engine():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    args = connect_args()
+    async_engine = create_async_engine(
+        settings.SQLALCHEMY_ASYNC_DATABASE_URI,
+        connect_args={"ssl": args["ssl_context"]} if args else {},
+        **pool_options(settings, is_async=True),
+    )
+    instrument(async_engine.sync_engine)
+    instrument_queries(async_engine.sync_engine)
+    return async_engine
+
+
+# objects stay usable after commit, nothing lazy loads outside the event loop
+@lru_cache(maxsize=None)
+def async_session_factory():
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
 
 
 # base class for all models
@@ -32,4 +88,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# dependency to get an async DB session
+async def get_async_db():
+    async with async_session_factory()() as db:
+        yield db
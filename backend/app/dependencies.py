@@ -1,26 +1,43 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_async_db, get_db
 from app.models.user import User
+from app.schemas.user import CurrentUser
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Session = Depends(get_db),
-) -> User:
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid authentication credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+# principals by email, so most requests need no user lookup; entries live at
+# most AUTH_CACHE_TTL_SECONDS. Deleting a user drops the entry only in the
+# worker that handled it, other workers keep it until the TTL runs out
+principal_cache = TTLCache(
+    ttl=settings.AUTH_CACHE_TTL_SECONDS, maxsize=settings.AUTH_CACHE_MAX_ENTRIES
+)
+
 
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid authentication credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+def invalidate_user(email: str):
+    principal_cache.invalidate(email)
+
+
+# decode the JWT and return its claims (jose is imported on the first
+# authenticated request, not at cold start)
+def token_claims(token: str) -> dict:
+    from jose import JWTError, jwt
 
     try:
         payload = jwt.decode(
@@ -31,14 +48,93 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    email = payload.get("sub")
+    if not payload.get("sub"):
+        raise credentials_exception
+
+    return payload
 
-    if not email:
+
+# cached principal for the token, None when it has to be loaded
+def cached_principal(claims: dict):
+    principal = principal_cache.get(claims["sub"])
+    # tokens carrying a uid must match the cached account (email reused after delete)
+    if principal is None or claims.get("uid") not in (None, principal.id):
+        return None
+    return principal
+
+
+def remember(claims: dict, user) -> CurrentUser:
+    if not user or claims.get("uid") not in (None, user.id):
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
+    principal = CurrentUser.model_validate(user)
+    principal_cache.set(claims["sub"], principal)
+    return principal
+
+
+# plain def: FastAPI runs it in the threadpool, so a cache miss's query never
+# blocks the event loop
+def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+
+    claims = token_claims(token)
+
+    principal = cached_principal(claims)
+    if principal:
+        return principal
+
+    user = db.query(User).filter(User.email == claims["sub"]).first()
+
+    return remember(claims, user)
+
+
+# same as get_current_user, for routes running on an AsyncSession
+# (AsyncSession is not imported here so the sync path never loads sqlalchemy.ext.asyncio)
+async def get_current_user_async(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db=Depends(get_async_db),
+) -> CurrentUser:
+
+    claims = token_claims(token)
+
+    principal = cached_principal(claims)
+    if principal:
+        return principal
+
+    user = (await db.execute(select(User).where(User.email == claims["sub"]))).scalars().first()
+
+    return remember(claims, user)
+
+
+# principal for a raw token; a miss is loaded in a short-lived session so
+# long-lived connections (event streams) never hold a pooled connection
+def principal_for_token(token: str) -> CurrentUser:
+
+    claims = token_claims(token)
+
+    principal = cached_principal(claims)
+    if principal:
+        return principal
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == claims["sub"]).first()
+    finally:
+        db.close()
+
+    return remember(claims, user)
+
+
+# EventSource cannot send headers, so streams also accept ?token=
+async def get_stream_user(
+    header_token: Annotated[Optional[str], Depends(optional_oauth2_scheme)],
+    token: Optional[str] = None,
+) -> CurrentUser:
 
-    if not user:
+    token = header_token or token
+    if not token:
         raise credentials_exception
 
-    return user
\ No newline at end of file
+    return await run_in_threadpool(principal_for_token, token)
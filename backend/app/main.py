@@ -3,12 +3,25 @@ import os
 # Add the 'backend' directory to sys.path so 'from app.routers' works on Vercel
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import APIRouter, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, reports, admin
+from fastapi.responses import PlainTextResponse
+from app.core import compression, jobs, metrics, profiling
+from app.core.config import settings
+from app.routers import auth, reports, report_events, admin, jobs as jobs_router
 
 
-app = FastAPI(title="KindSteps Support API")
+# background job workers live as long as the app
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await jobs.start()
+    yield
+    await jobs.stop()
+
+
+app = FastAPI(title="KindSteps Support API", lifespan=lifespan)
 
 
 # Allowed frontend URLs
@@ -24,18 +37,73 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# inside metrics, so response sizes are the bytes on the wire
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(compression.CompressionMiddleware)
+
+if settings.PROFILER_ENABLED:
+    app.add_middleware(profiling.ProfilerMiddleware)
+
+# outermost, so the timings include every other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+
+# Replace routes of `base` with same path/method routes from `overrides`, keeping route order
+def override_routes(base: APIRouter, overrides: APIRouter) -> APIRouter:
+    replacements = {(r.path, frozenset(r.methods)): r for r in overrides.routes}
+    merged = APIRouter()
+    merged.routes.extend(
+        replacements.get((r.path, frozenset(r.methods)), r) for r in base.routes
+    )
+    return merged
+
+
+auth_router, reports_router = auth.router, reports.router
+
+# async database path
+if settings.DB_ASYNC:
+    from app.routers import async_auth, async_reports
+
+    auth_router = override_routes(auth.router, async_auth.router)
+    reports_router = override_routes(reports.router, async_reports.router)
+
 
 # Include routers
-app.include_router(auth.router, prefix="/auth")
-app.include_router(reports.router, prefix="/reports")
+app.include_router(auth_router, prefix="/auth")
+# event streams first, "/reports/stream" would otherwise match "/reports/{id}"
+app.include_router(report_events.router, prefix="/reports")
+app.include_router(reports_router, prefix="/reports")
 app.include_router(admin.router, prefix="/admin")
+app.include_router(jobs_router.router, prefix="/jobs")
 
 @app.get("/health")
 def health_check():
-    from app.core.config import settings
+    from app.core.ai import cache_stats
+    from app.db.pool import pool_stats
+    from app.db.session import engine_created, get_engine
     return {
         "status": "ok",
         "DATABASE_URL_length": len(settings.DATABASE_URL) if settings.DATABASE_URL else 0,
         "secret_length": len(settings.SECRET_KEY) if settings.SECRET_KEY else 0,
-        "db_uri_startswith": settings.SQLALCHEMY_DATABASE_URI[:25] if settings.SQLALCHEMY_DATABASE_URI else "None"
-    }
\ No newline at end of file
+        "db_uri_startswith": settings.SQLALCHEMY_DATABASE_URI[:25] if settings.SQLALCHEMY_DATABASE_URI else "None",
+        "db_pool": pool_stats(get_engine()) if engine_created() else None,
+        "ai_cache": cache_stats(),
+        "jobs": jobs.stats(),
+    }
+
+
+# a public deployment only serves /metrics behind a token: without one the
+# route names, traffic and database timings would be open to anyone
+if settings.METRICS_ENABLED and (settings.METRICS_TOKEN or not settings.is_serverless):
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_endpoint(authorization: Optional[str] = Header(None)):
+        if settings.METRICS_TOKEN and authorization != f"Bearer {settings.METRICS_TOKEN}":
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+        from app.db.pool import pool_stats
+        from app.db.session import get_async_engine, get_engine
+        pools = {"sync": pool_stats(get_engine())}
+        if settings.DB_ASYNC:
+            pools["async"] = pool_stats(get_async_engine().sync_engine)
+        return PlainTextResponse(metrics.render(pools), media_type=metrics.CONTENT_TYPE)
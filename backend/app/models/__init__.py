@@ -1,2 +1,3 @@
 from app.models.user import User, UserRole
 from app.models.report import Report, ReportStatus, ReportPriority
+from app.models.job import Job, JobStatus
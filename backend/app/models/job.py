@@ -0,0 +1,47 @@
+import enum
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Index
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+# background jobs of the "database" job backend (app.core.jobs)
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # workers claim the oldest due job
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id = Column(String(32), primary_key=True)
+    name = Column(String, nullable=False)
+
+    # JSON handler arguments / return value
+    payload = Column(Text, nullable=False)
+    result = Column(Text)
+    error = Column(Text)
+
+    status = Column(String, default=JobStatus.queued.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, nullable=False)
+
+    # user who enqueued it, the only one (besides admins) who may read it
+    owner_id = Column(Integer, index=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # not picked up before run_at (retry backoff)
+    run_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    # a running job whose lease expired (worker died) is picked up again
+    lease_expires_at = Column(DateTime(timezone=True))
+
+    # time spent waiting for a worker and running (last attempt, milliseconds)
+    queue_ms = Column(Float)
+    duration_ms = Column(Float)
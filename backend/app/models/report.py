@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Float, Index
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.db.session import Base
 import enum
@@ -20,6 +20,10 @@ class ReportPriority(str, enum.Enum):
 
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        # keyset pagination order for the list endpoints
+        Index("ix_reports_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -29,13 +33,23 @@ class Report(Base):
     description = Column(Text, nullable=False)
     location = Column(String, nullable=False)
     location_details = Column(String)
-    photo_url = Column(String)
+
+    # sha256 key into the photo store
+    photo_key = Column(String(64))
+    photo_content_type = Column(String)
+    thumbnail_key = Column(String(64))
+
+    # legacy inline base64 photos, moved to the photo store by app.db.migrate
+    photo_url = deferred(Column(String))
 
     contact_name = Column(String, nullable=False)
     contact_phone = Column(String, nullable=False)
 
-    latitude = Column(String)
-    longitude = Column(String)
+    latitude = Column(Float)
+    longitude = Column(Float)
+
+    # app.core.geo grid cell of the coordinates, indexed for radius lookups
+    geo_cell = Column(Integer, index=True)
 
     status = Column(String, default=ReportStatus.received.value, index=True)
     priority = Column(String, default=ReportPriority.medium.value, index=True)
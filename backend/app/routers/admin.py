@@ -1,26 +1,37 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated, List, Union
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.serialization import json_response, rows_as_dicts
 from app.db.session import get_db
 from app.dependencies import get_current_user
-from app.models.user import User, UserRole
-from app.schemas.user import UserResponse
-from app.schemas.report import ReportResponse
-from app.services import admin_service
+from app.models.user import UserRole
+from app.schemas.user import CurrentUser, UserResponse
+from app.schemas.report import (
+    BulkRequest,
+    BulkResponse,
+    ReportExportParams,
+    ReportFilters,
+    ReportPage,
+    ReportSummaryPage,
+)
+from app.routers.reports import not_modified
+from app.services import admin_service, export_service, report_service
 
 router = APIRouter()
 
 
 # admin only dependency
-def require_admin(current_user: User = Depends(get_current_user)):
+def require_admin(current_user: CurrentUser = Depends(get_current_user)):
     if current_user.role != UserRole.admin:
         raise HTTPException(403, "Admins only")
     return current_user
 
 
 # staff dependency
-def require_staff(current_user: User = Depends(get_current_user)):
+def require_staff(current_user: CurrentUser = Depends(get_current_user)):
     if current_user.role not in [UserRole.admin, UserRole.rescue_team]:
         raise HTTPException(403, "Access denied")
     return current_user
@@ -34,7 +45,7 @@ def get_public_stats(db: Session = Depends(get_db)):
 @router.get("/stats")
 def get_dashboard_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_staff),
+    current_user: CurrentUser = Depends(require_staff),
 ):
     return admin_service.get_dashboard_stats(db)
 
@@ -42,17 +53,49 @@ def get_dashboard_stats(
 @router.get("/users", response_model=List[UserResponse])
 def list_users(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: CurrentUser = Depends(require_admin),
 ):
-    return admin_service.list_users(db)
+    return json_response(rows_as_dicts(UserResponse, admin_service.list_users(db)))
 
 
-@router.get("/reports", response_model=List[ReportResponse])
+@router.get("/reports", response_model=Union[ReportPage, ReportSummaryPage])
 def list_reports(
+    request: Request,
+    response: Response,
+    filters: Annotated[ReportFilters, Query()],
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: CurrentUser = Depends(require_admin),
 ):
-    return admin_service.list_reports(db)
+    rows = admin_service.list_reports(db, filters)
+    etag = report_service.list_etag(rows, None, filters.model_dump_json())
+    if cached := not_modified(request, response, etag):
+        return cached
+
+    return json_response(report_service.build_page(rows, filters.limit, filters.view), response)
+
+
+# Stream every report matching the filters as CSV or NDJSON
+@router.get("/reports/export")
+def export_reports(
+    params: Annotated[ReportExportParams, Query()],
+    current_user: CurrentUser = Depends(require_admin),
+):
+    filename = f"reports-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{params.format.value}"
+    return StreamingResponse(
+        export_service.export_reports(params, params.format),
+        media_type=export_service.MEDIA_TYPES[params.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# Assign/status/priority/delete many reports at once (one transaction)
+@router.post("/reports/bulk", response_model=BulkResponse)
+def bulk_update_reports(
+    request: BulkRequest,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_admin),
+):
+    return admin_service.bulk_update(db, request)
 
 
 @router.post("/reports/{report_id}/assign")
@@ -60,7 +103,7 @@ def assign_report(
     report_id: int,
     team_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: CurrentUser = Depends(require_admin),
 ):
     return admin_service.assign_report(db, report_id, team_id)
 
@@ -69,7 +112,7 @@ def assign_report(
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: CurrentUser = Depends(require_admin),
 ):
     return admin_service.delete_user(db, user_id, current_user)
 
@@ -78,6 +121,6 @@ def delete_user(
 def delete_report(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: CurrentUser = Depends(require_admin),
 ):
     return admin_service.delete_report(db, report_id)
\ No newline at end of file
@@ -0,0 +1,82 @@
+# AsyncSession versions of the auth routes (enabled with DB_ASYNC)
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.core.security import hash_password_async, verify_and_update_async, create_access_token
+from app.dependencies import get_current_user_async
+from app.models.user import User, UserRole
+from app.schemas.user import CurrentUser, UserCreate, UserResponse
+from app.schemas.token import Token
+from app.services import admin_service, assignment
+
+router = APIRouter()
+
+
+async def find_user(db: AsyncSession, email: str):
+    return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+
+# Register a new user
+@router.post("/signup", response_model=UserResponse)
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+
+    # check if email already exists
+    if await find_user(db, user.email):
+        raise HTTPException(400, "Email already registered")
+
+    new_user = User(
+        full_name=user.full_name,
+        email=user.email,
+        phone=user.phone,
+        role=user.role,
+        # hashing is CPU bound, keep it off the event loop
+        hashed_password=await hash_password_async(user.password),
+    )
+
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    admin_service.invalidate_stats()
+    if new_user.role == UserRole.rescue_team:
+        assignment.workload.invalidate()
+
+    return new_user
+
+
+# Login and return JWT token
+@router.post("/login", response_model=Token)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+
+    user = await find_user(db, form_data.username)
+
+    # validate password
+    valid, new_hash = (
+        await verify_and_update_async(form_data.password, user.hashed_password)
+        if user else (False, None)
+    )
+    if not valid:
+        raise HTTPException(401, "Invalid email or password")
+
+    # hash used outdated parameters, store it with the current ones
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+
+    return {
+        "access_token": create_access_token(subject=user.email, user_id=user.id),
+        "token_type": "bearer",
+        "user": user,
+    }
+
+
+# Get current logged-in user
+@router.get("/me", response_model=UserResponse)
+async def get_me(current_user: CurrentUser = Depends(get_current_user_async)):
+    return current_user
@@ -0,0 +1,212 @@
+# AsyncSession versions of the report CRUD routes (enabled with DB_ASYNC)
+# Routes not defined here keep using the sync handlers in reports.py
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, List, Optional, Union
+
+from app.core import events, geo
+from app.core.serialization import json_response
+from app.db.session import get_async_db
+from app.dependencies import get_current_user_async
+from app.models.report import Report, ReportStatus, ReportPriority
+from app.models.user import UserRole
+from app.schemas.user import CurrentUser
+from app.routers.reports import check_staff, is_conditional, not_modified, stage_photo, validator_headers
+from app.schemas.report import (
+    ReportFilters,
+    ReportPage,
+    ReportResponse,
+    ReportSummary,
+    ReportSummaryPage,
+    ReportUpdate,
+    ReportView,
+)
+from app.services import admin_service, assignment, report_jobs, report_service
+
+router = APIRouter()
+
+
+# populate_existing refreshes server-set columns (updated_at) and the team after a commit
+async def fetch_report(db: AsyncSession, id: int) -> Report:
+    stmt = (
+        report_service.report_select()
+        .where(Report.id == id)
+        .execution_options(populate_existing=True)
+    )
+    report = (await db.execute(stmt)).scalars().first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report
+
+
+# 304 from the cheap id/updated_at lookup when the client copy is current
+# (reporter_id: only answer for that reporter's reports)
+async def revalidate(
+    db: AsyncSession, id: int, request: Request, response: Response, reporter_id: Optional[int] = None
+):
+    if not is_conditional(request):
+        return None
+    row = (await db.execute(report_service.validators_stmt(id))).first()
+    if not row or reporter_id not in (None, row.reporter_id):
+        return None
+    return not_modified(request, response, report_service.report_etag(row), row.updated_at)
+
+
+# Create new report
+@router.post("/", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
+async def create_report(
+    condition: str = Form(...),
+    description: str = Form(...),
+    location: str = Form(...),
+    contact_name: str = Form(...),
+    contact_phone: str = Form(...),
+    priority: ReportPriority = Form(ReportPriority.medium),
+    photo: UploadFile = File(None),
+    latitude: Optional[float] = Form(None, ge=-90, le=90),
+    longitude: Optional[float] = Form(None, ge=-180, le=180),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async),
+):
+
+    upload_key = await run_in_threadpool(stage_photo, photo)
+
+    report = Report(
+        reporter_id=current_user.id,
+        condition=condition,
+        description=description,
+        location=location,
+        contact_name=contact_name,
+        contact_phone=contact_phone,
+        priority=priority.value,
+        latitude=latitude,
+        longitude=longitude,
+        geo_cell=geo.cell_for(latitude, longitude),
+        status=ReportStatus.received.value,
+        assigned_team_id=await assignment.pick_team_async(db, priority.value, latitude, longitude),
+    )
+
+    db.add(report)
+    await db.commit()
+    admin_service.invalidate_stats()
+
+    report = await fetch_report(db, report.id)
+    await events.publish_async(events.report_event("created", report))
+
+    photo_job = await run_in_threadpool(
+        report_jobs.enqueue_report_jobs, report.id, upload_key, current_user.id
+    )
+    if photo_job and photo_job.finished_at:  # no workers, it ran inline
+        report = await fetch_report(db, report.id)
+
+    return report
+
+
+# Get reports (newest first, paginated with next_cursor)
+@router.get("/", response_model=Union[ReportPage, ReportSummaryPage])
+async def list_reports(
+    request: Request,
+    response: Response,
+    filters: Annotated[ReportFilters, Query()],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async),
+):
+
+    reporter_id = current_user.id if current_user.role == UserRole.user else None
+
+    stmt = report_service.list_reports_stmt(filters, reporter_id)
+    rows = (await db.execute(stmt)).scalars().all()
+
+    etag = report_service.list_etag(rows, reporter_id, filters.model_dump_json())
+    if cached := not_modified(request, response, etag):
+        return cached
+
+    return json_response(report_service.build_page(rows, filters.limit, filters.view), response)
+
+
+# Get reports assignments
+@router.get("/my-assignments", response_model=Union[List[ReportResponse], List[ReportSummary]])
+async def my_assignments(
+    request: Request,
+    response: Response,
+    view: ReportView = ReportView.full,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async),
+):
+    check_staff(current_user)
+
+    stmt = report_service.assignments_stmt(current_user.id, view)
+    rows = (await db.execute(stmt)).scalars().all()
+
+    etag = report_service.list_etag(rows, current_user.id, view.value)
+    if cached := not_modified(request, response, etag):
+        return cached
+
+    return json_response(report_service.rows_content(rows, view), response)
+
+
+# Track report by ID (Public/Any user)
+@router.get("/track/{id}", response_model=ReportResponse)
+async def track_report(
+    id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async),
+):
+    if cached := await revalidate(db, id, request, response):
+        return cached
+
+    report = await fetch_report(db, id)
+    response.headers.update(validator_headers(report_service.report_etag(report), report.updated_at))
+    return report
+
+
+# Get report by ID
+@router.get("/{id}", response_model=ReportResponse)
+async def get_report(
+    id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async),
+):
+    reporter_id = current_user.id if current_user.role == UserRole.user else None
+    if cached := await revalidate(db, id, request, response, reporter_id):
+        return cached
+
+    report = await fetch_report(db, id)
+
+    if current_user.role == UserRole.user and report.reporter_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    response.headers.update(validator_headers(report_service.report_etag(report), report.updated_at))
+    return report
+
+
+# Update report
+@router.put("/{id}", response_model=ReportResponse)
+async def update_report(
+    id: int,
+    report_update: ReportUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user_async),
+):
+
+    check_staff(current_user)
+
+    report = await fetch_report(db, id)
+
+    before = assignment.report_state(report)
+    for key, value in report_update.model_dump(exclude_unset=True).items():
+        setattr(report, key, value.value if hasattr(value, "value") else value)
+
+    await db.commit()
+    admin_service.invalidate_stats()
+
+    report = await fetch_report(db, id)
+    assignment.workload.track(before, assignment.report_state(report))
+    await events.publish_async(events.report_event("updated", report))
+
+    return report
@@ -5,11 +5,12 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import hash_password, verify_and_update, create_access_token
 from app.dependencies import get_current_user
-from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse
+from app.models.user import User, UserRole
+from app.schemas.user import CurrentUser, UserCreate, UserResponse
 from app.schemas.token import Token
+from app.services import admin_service, assignment
 
 router = APIRouter()
 
@@ -33,6 +34,9 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    admin_service.invalidate_stats()
+    if new_user.role == UserRole.rescue_team:
+        assignment.workload.invalidate()
 
     return new_user
 
@@ -45,11 +49,17 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     user = db.query(User).filter_by(email=form_data.username).first()
 
     # validate password
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = verify_and_update(form_data.password, user.hashed_password) if user else (False, None)
+    if not valid:
         raise HTTPException(401, "Invalid email or password")
 
+    # hash used outdated parameters, store it with the current ones
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+
     return {
-        "access_token": create_access_token(subject=user.email),
+        "access_token": create_access_token(subject=user.email, user_id=user.id),
         "token_type": "bearer",
         "user": user,
     }
@@ -57,5 +67,5 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
 # Get current logged-in user
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: CurrentUser = Depends(get_current_user)):
     return current_user
\ No newline at end of file
@@ -0,0 +1,20 @@
+# Status of background jobs (photo processing, background AI analysis)
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core import jobs
+from app.dependencies import get_current_user
+from app.models.user import UserRole
+from app.schemas.job import JobResponse
+from app.schemas.user import CurrentUser
+
+router = APIRouter()
+
+
+# Poll a job: users see the jobs they queued, admins every job
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, current_user: CurrentUser = Depends(get_current_user)):
+    job = jobs.get_job(job_id)
+    if job is None or (current_user.role != UserRole.admin and job.owner_id != current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
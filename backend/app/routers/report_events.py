@@ -0,0 +1,80 @@
+# Live report updates: Server-Sent Events and WebSocket, filtered per user role
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import get_broker, visible_to
+from app.dependencies import get_stream_user, principal_for_token
+from app.schemas.user import CurrentUser
+
+router = APIRouter()
+
+
+async def sse_events(request: Request, user: CurrentUser):
+    async with get_broker().subscribe() as queue:
+        # reconnect delay for EventSource after a dropped connection
+        yield "retry: 5000\n\n"
+
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=settings.EVENT_STREAM_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # comment line, keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+
+            if visible_to(event, user):
+                yield f"data: {json.dumps(event)}\n\n"
+
+
+# Stream report changes (created/updated/assigned/deleted)
+@router.get("/stream")
+async def stream_report_events(
+    request: Request,
+    current_user: CurrentUser = Depends(get_stream_user),
+):
+    return StreamingResponse(
+        sse_events(request, current_user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def wait_closed(websocket: WebSocket):
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+# Same events over a WebSocket (?token=...)
+@router.websocket("/ws")
+async def report_events_ws(websocket: WebSocket, token: str = ""):
+    try:
+        user = await run_in_threadpool(principal_for_token, token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    async with get_broker().subscribe() as queue:
+        closed = asyncio.create_task(wait_closed(websocket))
+        try:
+            while True:
+                event = asyncio.create_task(queue.get())
+                await asyncio.wait({event, closed}, return_when=asyncio.FIRST_COMPLETED)
+
+                if not event.done():
+                    event.cancel()
+                    break
+
+                if visible_to(event.result(), user):
+                    await websocket.send_json(event.result())
+        finally:
+            closed.cancel()
@@ -1,45 +1,189 @@
 # Handles Incident Reporting and Case Management
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
-import base64
+from typing import Annotated, List, Optional, Union
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
 
 from app.db.session import get_db
 from app.dependencies import get_current_user
 from app.models.report import Report, ReportStatus, ReportPriority
-from app.models.user import User, UserRole
-from app.schemas.report import ReportResponse, ReportUpdate
-from app.core.ai import analyze_image_for_description
+from app.models.user import UserRole
+from app.schemas.user import CurrentUser
+from app.schemas.job import JobResponse
+from app.schemas.report import (
+    NearbyReport,
+    ReportFilters,
+    ReportPage,
+    ReportResponse,
+    ReportSummary,
+    ReportSummaryPage,
+    ReportUpdate,
+    ReportView,
+)
+from app.core.ai import AIBusyError, analyze_image_async
+from app.core.config import settings
+from app.core import events, geo, jobs
+from app.core.serialization import json_response
+from app.core.images import InvalidImageError, check_image, ingest_image_async
+from app.services.photo_storage import PhotoTooLargeError, get_photo_storage, stage_upload
+from app.services import admin_service, assignment, report_jobs, report_service, search
 
 router = APIRouter()
 
 
-# Convert uploaded image to base64
-def convert_to_b64(photo: UploadFile):
+def photo_too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Photo exceeds {settings.PHOTO_MAX_BYTES} bytes")
+
+
+# Read an upload, refusing anything over PHOTO_MAX_BYTES
+def read_upload(photo: UploadFile) -> bytes:
+    data = photo.file.read(settings.PHOTO_MAX_BYTES + 1)
+    if len(data) > settings.PHOTO_MAX_BYTES:
+        raise photo_too_large()
+    return data
+
+
+def invalid_image(e: InvalidImageError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+
+
+# Validate an upload's format and stream it to storage for the photo job,
+# returns its storage key
+def stage_photo(photo: Optional[UploadFile]) -> Optional[str]:
     if not photo:
         return None
-    return base64.b64encode(photo.file.read()).decode("utf-8")
+    try:
+        check_image(photo.file)
+        return stage_upload(get_photo_storage(), photo.file)
+    except InvalidImageError as e:
+        raise invalid_image(e)
+    except PhotoTooLargeError:
+        raise photo_too_large()
+
+
+# Parse a single "bytes=start-end" range, None when absent or unsupported
+def parse_range(range_header: Optional[str], size: int):
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    start, _, end = range_header[6:].strip().partition("-")
+    try:
+        if start:
+            first = int(start)
+            last = min(int(end), size - 1) if end else size - 1
+        else:
+            first = max(size - int(end), 0)
+            last = size - 1
+    except ValueError:
+        return None
+
+    if first > last:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return first, last
+
+
+# Conditional GET helpers (weak ETags, Last-Modified)
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_fresh(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    # If-None-Match wins over If-Modified-Since; weak comparison ignores W/
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    # no-cache: browsers keep the copy but revalidate it on every use
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(report_service.as_utc(last_modified), usegmt=True)
+    return headers
+
+
+# 304 response when the client copy is current, otherwise the validators go on `response`
+def not_modified(
+    request: Request, response: Response, etag: str, last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    headers = validator_headers(etag, last_modified)
+
+    if is_fresh(request, etag, report_service.as_utc(last_modified)):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
+# 304 from the cheap id/updated_at lookup when the client copy is current
+# (reporter_id: only answer for that reporter's reports)
+def revalidate(db: Session, id: int, request: Request, response: Response, reporter_id: Optional[int] = None):
+    if not is_conditional(request):
+        return None
+    row = db.execute(report_service.validators_stmt(id)).first()
+    if not row or reporter_id not in (None, row.reporter_id):
+        return None
+    return not_modified(request, response, report_service.report_etag(row), row.updated_at)
 
 
 # Check if user is admin or rescue team
-def check_staff(user: User):
+def check_staff(user: CurrentUser):
     if user.role not in [UserRole.admin, UserRole.rescue_team]:
         raise HTTPException(status_code=403, detail="Access denied")
 
 
-# AI image analysis
+# AI image analysis (background=true: 202 with a job to poll at /jobs/{id})
 @router.post("/ai-analyze")
 async def ai_analyze(
     photo: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    background: bool = False,
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    return analyze_image_for_description(
-        await photo.read(), mime_type=photo.content_type
-    )
-
-
-# Create new report
+    if background:
+        upload_key = await run_in_threadpool(stage_photo, photo)
+        job = await run_in_threadpool(
+            jobs.enqueue, "analyze_photo", {"upload_key": upload_key}, current_user.id
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=JobResponse.model_validate(job).model_dump(mode="json"),
+            headers={"Location": f"/jobs/{job.id}"},
+        )
+
+    try:
+        # the model gets the downscaled image, not the phone original
+        data = await run_in_threadpool(read_upload, photo)
+        image = await ingest_image_async(data, with_thumbnail=False)
+        return await analyze_image_async(image.data, mime_type=image.content_type)
+    except InvalidImageError as e:
+        raise invalid_image(e)
+    except AIBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI analysis is busy, please try again",
+            headers={"Retry-After": "5"},
+        )
+
+
+# Create new report (the photo is processed by a background job)
 @router.post("/", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
 def create_report(
     condition: str = Form(...),
@@ -49,13 +193,13 @@ def create_report(
     contact_phone: str = Form(...),
     priority: ReportPriority = Form(ReportPriority.medium),
     photo: UploadFile = File(None),
-    latitude: Optional[str] = Form(None),
-    longitude: Optional[str] = Form(None),
+    latitude: Optional[float] = Form(None, ge=-90, le=90),
+    longitude: Optional[float] = Form(None, ge=-180, le=180),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
 
-    team = db.query(User).filter(User.email == "team@kindsteps.com").first()
+    upload_key = stage_photo(photo)
 
     report = Report(
         reporter_id=current_user.id,
@@ -67,51 +211,121 @@ def create_report(
         priority=priority.value,
         latitude=latitude,
         longitude=longitude,
-        photo_url=convert_to_b64(photo),
+        geo_cell=geo.cell_for(latitude, longitude),
         status=ReportStatus.received.value,
-        assigned_team_id=team.id if team else None,
+        assigned_team_id=assignment.pick_team(db, priority.value, latitude, longitude),
     )
 
     db.add(report)
     db.commit()
     db.refresh(report)
+    admin_service.invalidate_stats()
+    events.publish(events.report_event("created", report))
+
+    photo_job = report_jobs.enqueue_report_jobs(report.id, upload_key, current_user.id)
+    if photo_job and photo_job.finished_at:  # no workers, it ran inline
+        db.refresh(report)
 
     return report
 
 
-# Get reports
-@router.get("/", response_model=List[ReportResponse])
+# Get reports (newest first, paginated with next_cursor)
+@router.get("/", response_model=Union[ReportPage, ReportSummaryPage])
 def list_reports(
+    request: Request,
+    response: Response,
+    filters: Annotated[ReportFilters, Query()],
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
 
-    if current_user.role == UserRole.user:
-        return db.query(Report).filter(Report.reporter_id == current_user.id).all()
+    reporter_id = current_user.id if current_user.role == UserRole.user else None
+
+    rows = report_service.list_reports(db, filters, reporter_id=reporter_id)
+    etag = report_service.list_etag(rows, reporter_id, filters.model_dump_json())
+    if cached := not_modified(request, response, etag):
+        return cached
 
-    return db.query(Report).all()
+    return json_response(report_service.build_page(rows, filters.limit, filters.view), response)
 
 
 # Get reports assignments (Move above generic ID route)
-@router.get("/my-assignments", response_model=List[ReportResponse])
+@router.get("/my-assignments", response_model=Union[List[ReportResponse], List[ReportSummary]])
 def my_assignments(
+    request: Request,
+    response: Response,
+    view: ReportView = ReportView.full,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     check_staff(current_user)
-    return db.query(Report).filter(Report.assigned_team_id == current_user.id).all()
+
+    rows = report_service.list_assignments(db, current_user.id, view)
+    etag = report_service.list_etag(rows, current_user.id, view.value)
+    if cached := not_modified(request, response, etag):
+        return cached
+
+    return json_response(report_service.rows_content(rows, view), response)
+
+
+# Full-text search over condition, location, description and field review (best match first)
+@router.get("/search", response_model=ReportSummaryPage)
+def search_reports(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    reporter_id = current_user.id if current_user.role == UserRole.user else None
+    return search.search_reports(db, q, limit, cursor, reporter_id)
+
+
+# Reports within radius_km of a point, nearest first
+@router.get("/nearby", response_model=List[NearbyReport])
+def nearby_reports(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10, gt=0, le=100),
+    limit: int = Query(50, ge=1, le=200),
+    unassigned: bool = False,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    check_staff(current_user)
+    return report_service.nearby_reports(db, lat, lon, radius_km, limit, unassigned)
+
+
+# Closest open reports without a team (dispatch)
+@router.get("/nearby/unassigned", response_model=List[NearbyReport])
+def nearest_unassigned(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    check_staff(current_user)
+    return report_service.nearest_unassigned(db, lat, lon, limit)
 
 
 # Track report by ID (Public/Any user)
 @router.get("/track/{id}", response_model=ReportResponse)
 def track_report(
     id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    report = db.query(Report).filter(Report.id == id).first()
+    if cached := revalidate(db, id, request, response):
+        return cached
+
+    report = report_service.get_report(db, id)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
+
+    response.headers.update(validator_headers(report_service.report_etag(report), report.updated_at))
     return report
 
 
@@ -119,10 +333,16 @@ def track_report(
 @router.get("/{id}", response_model=ReportResponse)
 def get_report(
     id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    report = db.query(Report).filter(Report.id == id).first()
+    reporter_id = current_user.id if current_user.role == UserRole.user else None
+    if cached := revalidate(db, id, request, response, reporter_id):
+        return cached
+
+    report = report_service.get_report(db, id)
 
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
@@ -130,9 +350,61 @@ def get_report(
     if current_user.role == UserRole.user and report.reporter_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
 
+    response.headers.update(validator_headers(report_service.report_etag(report), report.updated_at))
     return report
 
 
+# Stream report photo or its thumbnail (supports ETag and Range)
+@router.get("/{id}/photo")
+def get_report_photo(
+    id: int,
+    thumbnail: bool = False,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    report = (
+        db.query(Report.reporter_id, Report.photo_key, Report.thumbnail_key, Report.photo_content_type)
+        .filter(Report.id == id)
+        .first()
+    )
+    key = report and (report.thumbnail_key if thumbnail else report.photo_key)
+
+    if not key:
+        raise HTTPException(status_code=404, detail="Photo not found")
+
+    if current_user.role == UserRole.user and report.reporter_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    etag = f'"{key}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+
+    if if_none_match and etag in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    storage = get_photo_storage()
+    try:
+        size = storage.size(key)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Photo not found")
+    byte_range = parse_range(range_header, size)
+    start, end = byte_range or (0, size - 1)
+
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return StreamingResponse(
+        storage.iter_range(key, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=report.photo_content_type,
+        headers=headers,
+    )
 
 
 # Update report
@@ -141,20 +413,24 @@ def update_report(
     id: int,
     report_update: ReportUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
 
     check_staff(current_user)
 
-    report = db.query(Report).filter(Report.id == id).first()
+    report = report_service.get_report(db, id)
 
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
+    before = assignment.report_state(report)
     for key, value in report_update.model_dump(exclude_unset=True).items():
         setattr(report, key, value.value if hasattr(value, "value") else value)
 
     db.commit()
     db.refresh(report)
+    assignment.workload.track(before, assignment.report_state(report))
+    admin_service.invalidate_stats()
+    events.publish(events.report_event("updated", report))
 
     return report
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+from datetime import datetime
+from app.models.job import JobStatus
+
+
+class JobResponse(BaseModel):
+    id: str
+    name: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # milliseconds waiting for a worker / running, last attempt
+    queue_ms: Optional[float] = None
+    duration_ms: Optional[float] = None
+
+    class Config:
+        from_attributes = True
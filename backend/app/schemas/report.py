@@ -1,7 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
-from app.models.report import ReportPriority
+import enum
+from app.models.report import ReportPriority, ReportStatus
 
 
 class ReportBase(BaseModel):
@@ -11,8 +12,8 @@ class ReportBase(BaseModel):
     location_details: Optional[str] = None
     contact_name: str
     contact_phone: str
-    latitude: Optional[str] = None
-    longitude: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     priority: ReportPriority = ReportPriority.medium
 
 
@@ -41,7 +42,8 @@ class ReportResponse(BaseModel):
     location_details: Optional[str] = None
     contact_name: str
     contact_phone: str
-    photo_url: Optional[str] = None
+    photo_key: Optional[str] = None
+    thumbnail_key: Optional[str] = None
     status: str
     priority: str
     created_at: datetime
@@ -50,9 +52,105 @@ class ReportResponse(BaseModel):
     assigned_team_name: Optional[str] = None
     assigned_team_phone: Optional[str] = None
     rescued_location: Optional[str] = None
-    latitude: Optional[str] = None
-    longitude: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     field_review: Optional[str] = None
 
     class Config:
         from_attributes = True
+
+
+# list screens only need these columns (no description, field review or photo)
+class ReportSummary(BaseModel):
+    id: int
+    condition: str
+    location: str
+    status: str
+    priority: str
+    created_at: datetime
+    updated_at: datetime
+    assigned_team_id: Optional[int] = None
+    assigned_team_name: Optional[str] = None
+    thumbnail_key: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+# dispatch lookups, nearest first
+class NearbyReport(ReportSummary):
+    latitude: float
+    longitude: float
+    distance_km: float = 0
+
+
+class ReportView(str, enum.Enum):
+    full = "full"
+    summary = "summary"
+
+
+# filters shared by the report list and export endpoints
+class ReportFilterBase(BaseModel):
+    status: Optional[ReportStatus] = None
+    priority: Optional[ReportPriority] = None
+    assigned_team_id: Optional[int] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+
+# query parameters of the report list endpoints
+class ReportFilters(ReportFilterBase):
+    cursor: Optional[str] = None
+    limit: int = Field(50, ge=1, le=200)
+    view: ReportView = ReportView.full
+
+
+class ExportFormat(str, enum.Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class ReportExportParams(ReportFilterBase):
+    format: ExportFormat = ExportFormat.csv
+
+
+class ReportPage(BaseModel):
+    items: List[ReportResponse]
+    next_cursor: Optional[str] = None
+
+
+class ReportSummaryPage(BaseModel):
+    items: List[ReportSummary]
+    next_cursor: Optional[str] = None
+
+
+class BulkAction(str, enum.Enum):
+    assign = "assign"
+    status = "status"
+    priority = "priority"
+    delete = "delete"
+
+
+# one set-based change: assign needs team_id, status/priority the new value
+class BulkOperation(BaseModel):
+    action: BulkAction
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+    team_id: Optional[int] = None
+    status: Optional[ReportStatus] = None
+    priority: Optional[ReportPriority] = None
+
+
+# operations run in order, in one transaction
+class BulkRequest(BaseModel):
+    operations: List[BulkOperation] = Field(..., min_length=1, max_length=20)
+
+
+class BulkResult(BaseModel):
+    id: int
+    action: BulkAction
+    ok: bool
+    detail: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    results: List[BulkResult]
@@ -22,3 +22,11 @@ class UserResponse(UserBase):
 
     class Config:
         from_attributes = True
+
+
+# authenticated principal, cached between requests by get_current_user
+class CurrentUser(UserResponse):
+
+    class Config:
+        from_attributes = True
+        frozen = True
@@ -1,39 +1,89 @@
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
+from app.core import events
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models.user import User, UserRole
 from app.models.report import Report, ReportStatus
+from app.schemas.report import BulkAction, BulkRequest, BulkResponse, BulkResult, ReportFilters
+from app.schemas.user import CurrentUser
+from app.dependencies import invalidate_user
+from app.services import assignment, report_service
 from fastapi import HTTPException
 
+# stats are cached per worker and invalidated on every report/user write
+stats_cache = TTLCache(
+    ttl=settings.STATS_CACHE_TTL_SECONDS,
+    stale_ttl=settings.STATS_CACHE_STALE_SECONDS,
+)
+
+
+def invalidate_stats():
+    stats_cache.invalidate()
+
+
+# run a query in its own session (stale-while-revalidate refresh thread)
+def _in_new_session(query):
+    def run():
+        db = SessionLocal()
+        try:
+            return query(db)
+        finally:
+            db.close()
+    return run
+
+
+def _report_counts(db: Session) -> dict:
+    rows = db.query(Report.status, func.count(Report.id)).group_by(Report.status).all()
+    return {status: count for status, count in rows}
+
+
+def _user_counts(db: Session) -> dict:
+    rows = db.query(User.role, func.count(User.id)).group_by(User.role).all()
+    return {role: count for role, count in rows}
+
+
+def _cached(db: Session, key: str, query):
+    return stats_cache.get_or_load(key, lambda: query(db), refresh=_in_new_session(query))
+
+
 def get_public_stats(db: Session):
-    total_count = db.query(Report).count()
-    resolved_count = db.query(Report).filter(Report.status == ReportStatus.resolved.value).count()
-    active_count = db.query(Report).filter(Report.status != ReportStatus.resolved.value).count()
-    
+    counts = _cached(db, "reports", _report_counts)
+    resolved_count = counts.get(ReportStatus.resolved.value, 0)
+
     return {
-        "total_reports": total_count,
+        "total_reports": sum(counts.values()),
         "total_rescues": resolved_count,
-        "active_missions": active_count
+        "active_missions": sum(
+            count for status, count in counts.items()
+            if status is not None and status != ReportStatus.resolved.value
+        ),
     }
 
 def get_dashboard_stats(db: Session):
+    reports = _cached(db, "reports", _report_counts)
+    users = _cached(db, "users", _user_counts)
+
     return {
         "users": {
-            "total": db.query(User).count(),
-            "rescue_teams": db.query(User).filter(User.role == UserRole.rescue_team).count()
+            "total": sum(users.values()),
+            "rescue_teams": users.get(UserRole.rescue_team, 0)
         },
         "reports": {
-            "total": db.query(Report).count(),
-            "received": db.query(Report).filter(Report.status == ReportStatus.received.value).count(),
-            "active": db.query(Report).filter(Report.status == ReportStatus.active.value).count(),
-            "in_progress": db.query(Report).filter(Report.status == ReportStatus.in_progress.value).count(),
-            "resolved": db.query(Report).filter(Report.status == ReportStatus.resolved.value).count()
+            "total": sum(reports.values()),
+            "received": reports.get(ReportStatus.received.value, 0),
+            "active": reports.get(ReportStatus.active.value, 0),
+            "in_progress": reports.get(ReportStatus.in_progress.value, 0),
+            "resolved": reports.get(ReportStatus.resolved.value, 0)
         }
     }
 
 def list_users(db: Session):
     return db.query(User).all()
 
-def list_reports(db: Session):
-    return db.query(Report).all()
+def list_reports(db: Session, filters: ReportFilters):
+    return report_service.list_reports(db, filters)
 
 def assign_report(db: Session, report_id: int, team_id: int):
     report = db.query(Report).filter(Report.id == report_id).first()
@@ -44,13 +94,17 @@ def assign_report(db: Session, report_id: int, team_id: int):
     if not team:
         raise HTTPException(status_code=400, detail="Invalid rescue team ID")
     
+    before = assignment.report_state(report)
     report.assigned_team_id = team_id
     report.status = ReportStatus.in_progress.value
     db.commit()
+    invalidate_stats()
     db.refresh(report)
+    assignment.workload.track(before, assignment.report_state(report))
+    events.publish(events.report_event("assigned", report))
     return report
 
-def delete_user(db: Session, user_id: int, current_user: User):
+def delete_user(db: Session, user_id: int, current_user: CurrentUser):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -58,12 +112,112 @@ def delete_user(db: Session, user_id: int, current_user: User):
         raise HTTPException(status_code=400, detail="Cannot delete yourself")
     db.delete(user)
     db.commit()
+    invalidate_user(user.email)
+    invalidate_stats()
+    if user.role == UserRole.rescue_team:
+        assignment.workload.invalidate()
     return {"detail": "User deleted"}
 
 def delete_report(db: Session, report_id: int):
     report = db.query(Report).filter(Report.id == report_id).first()
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
+    # built before the delete, the instance is expired once committed
+    event = events.report_event("deleted", report)
+    before = assignment.report_state(report)
     db.delete(report)
     db.commit()
+    invalidate_stats()
+    assignment.workload.track(before, None)
+    events.publish(event)
     return {"detail": "Report deleted"}
+
+
+# columns needed for per-id results, workload tracking and change events
+STATE_COLUMNS = (
+    Report.id,
+    Report.reporter_id,
+    Report.assigned_team_id,
+    Report.status,
+    Report.priority,
+    Report.latitude,
+    Report.longitude,
+    Report.geo_cell,
+    Report.updated_at,
+)
+
+BULK_EVENTS = {BulkAction.assign: "assigned", BulkAction.delete: "deleted"}
+
+
+# column values for an operation, or the reason every id in it fails
+def _bulk_values(db: Session, op):
+    if op.action == BulkAction.assign:
+        team = op.team_id is not None and db.query(User.id).filter(
+            User.id == op.team_id, User.role == UserRole.rescue_team
+        ).first()
+        if not team:
+            return None, "Invalid rescue team ID"
+        return {Report.assigned_team_id: op.team_id, Report.status: ReportStatus.in_progress.value}, None
+    if op.action == BulkAction.status:
+        if op.status is None:
+            return None, "status is required"
+        return {Report.status: op.status.value}, None
+    if op.action == BulkAction.priority:
+        if op.priority is None:
+            return None, "priority is required"
+        return {Report.priority: op.priority.value}, None
+    return {}, None
+
+
+# every operation is one UPDATE/DELETE ... WHERE id IN (...), all in one transaction
+def bulk_update(db: Session, request: BulkRequest) -> BulkResponse:
+    ids = {report_id for op in request.operations for report_id in op.ids}
+    before = {
+        row.id: row
+        for row in db.execute(select(*STATE_COLUMNS).where(Report.id.in_(ids)).with_for_update())
+    }
+
+    remaining = set(before)
+    changed = {}
+    results = []
+
+    for op in request.operations:
+        op_ids = list(dict.fromkeys(op.ids))
+        values, error = _bulk_values(db, op)
+        found = [] if error else [i for i in op_ids if i in remaining]
+
+        if found and op.action == BulkAction.delete:
+            db.execute(delete(Report).where(Report.id.in_(found)))
+            remaining.difference_update(found)
+        elif found:
+            db.execute(
+                update(Report).where(Report.id.in_(found)).values(values),
+                execution_options={"synchronize_session": False},
+            )
+        changed.update(dict.fromkeys(found, BULK_EVENTS.get(op.action, "updated")))
+
+        found = set(found)
+        for report_id in op_ids:
+            results.append(BulkResult(
+                id=report_id,
+                action=op.action,
+                ok=report_id in found,
+                detail=error or (None if report_id in found else "Report not found"),
+            ))
+
+    db.commit()
+
+    if changed:
+        after = {
+            row.id: row
+            for row in db.execute(select(*STATE_COLUMNS).where(Report.id.in_(changed.keys() & remaining)))
+        }
+        for report_id, event_type in changed.items():
+            row = after.get(report_id)
+            assignment.workload.track(
+                assignment.report_state(before[report_id]), row and assignment.report_state(row)
+            )
+            events.publish(events.report_event(event_type, row or before[report_id]))
+        invalidate_stats()
+
+    return BulkResponse(results=results)
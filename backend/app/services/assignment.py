@@ -0,0 +1,178 @@
+# Automatic rescue team assignment
+#
+# A per-worker index of every rescue team's open workload (count, priority weight
+# and the centroid of its open report coordinates) is loaded with one GROUP BY
+# query, updated in place on assign/update/resolve/delete and reloaded every
+# ASSIGNMENT_INDEX_TTL_SECONDS so workers converge on writes made by the others.
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import Select, and_, case, func, select
+
+from app.core import geo
+from app.core.config import settings
+from app.models.report import Report, ReportPriority, ReportStatus
+from app.models.user import User, UserRole
+
+PRIORITY_WEIGHTS = {
+    ReportPriority.low.value: 1,
+    ReportPriority.medium.value: 2,
+    ReportPriority.high.value: 3,
+}
+
+# (team_id, open, priority, latitude, longitude) of a report, as the index counts it
+ReportState = Tuple[Optional[int], bool, str, Optional[float], Optional[float]]
+
+
+@dataclass
+class TeamLoad:
+    open_reports: int = 0
+    weight: int = 0
+    located: int = 0
+    lat_sum: float = 0.0
+    lon_sum: float = 0.0
+
+    def centroid(self) -> Optional[Tuple[float, float]]:
+        if not self.located:
+            return None
+        return self.lat_sum / self.located, self.lon_sum / self.located
+
+    def add(self, priority: str, lat: Optional[float], lon: Optional[float], sign: int = 1):
+        self.open_reports += sign
+        self.weight += sign * PRIORITY_WEIGHTS.get(priority, 2)
+        if geo.valid_coordinates(lat, lon):
+            self.located += sign
+            self.lat_sum += sign * lat
+            self.lon_sum += sign * lon
+
+
+def report_state(report) -> ReportState:
+    # geo_cell is only set for valid coordinates, same rule as workload_stmt
+    located = report.geo_cell is not None
+    return (
+        report.assigned_team_id,
+        report.status != ReportStatus.resolved.value,
+        report.priority,
+        float(report.latitude) if located else None,
+        float(report.longitude) if located else None,
+    )
+
+
+# every rescue team with its open reports aggregated (teams without work included)
+def workload_stmt() -> Select:
+    is_open = and_(Report.assigned_team_id == User.id, Report.status != ReportStatus.resolved.value)
+    # the outer join yields one all-NULL row for a team without open reports
+    weight = case(
+        (Report.id.is_(None), 0),
+        *((Report.priority == p, w) for p, w in PRIORITY_WEIGHTS.items()),
+        else_=2,
+    )
+    return (
+        select(
+            User.id,
+            func.count(Report.id),
+            func.coalesce(func.sum(weight), 0),
+            func.count(Report.geo_cell),
+            func.coalesce(func.sum(case((Report.geo_cell.isnot(None), Report.latitude))), 0),
+            func.coalesce(func.sum(case((Report.geo_cell.isnot(None), Report.longitude))), 0),
+        )
+        .outerjoin(Report, is_open)
+        .where(User.role == UserRole.rescue_team)
+        .group_by(User.id)
+    )
+
+
+# policies: score every team for a new report, lowest score wins (ties -> lower id)
+
+def least_loaded(load: TeamLoad, priority: str, lat, lon) -> float:
+    return load.open_reports
+
+
+def priority_weighted(load: TeamLoad, priority: str, lat, lon) -> float:
+    return load.weight
+
+
+# priority weight plus distance to the team's current area of work,
+# ASSIGNMENT_KM_PER_WEIGHT kilometres count as much as one unit of weight
+def balanced(load: TeamLoad, priority: str, lat, lon) -> float:
+    centroid = load.centroid()
+    if centroid is None or not geo.valid_coordinates(lat, lon):
+        return load.weight
+    return load.weight + geo.haversine_km(lat, lon, *centroid) / settings.ASSIGNMENT_KM_PER_WEIGHT
+
+
+POLICIES: Dict[str, Callable[[TeamLoad, str, Optional[float], Optional[float]], float]] = {
+    "least_loaded": least_loaded,
+    "priority": priority_weighted,
+    "balanced": balanced,
+}
+
+
+class WorkloadIndex:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.teams: Dict[int, TeamLoad] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def needs_load(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def load(self, rows) -> None:
+        teams = {
+            team_id: TeamLoad(count, weight, located, lat_sum, lon_sum)
+            for team_id, count, weight, located, lat_sum, lon_sum in rows
+        }
+        with self._lock:
+            self.teams = teams
+            self._loaded_at = time.monotonic()
+
+    # teams added/removed: reload on next use
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    # choose a team for a new open report and count it right away
+    def pick(self, priority: str, lat=None, lon=None, policy: Optional[str] = None) -> Optional[int]:
+        score = POLICIES[policy or settings.ASSIGNMENT_POLICY]
+        with self._lock:
+            if not self.teams:
+                return None
+            team_id = min(self.teams, key=lambda t: (score(self.teams[t], priority, lat, lon), t))
+            self.teams[team_id].add(priority, lat, lon)
+        return team_id
+
+    # move a report's contribution from its old state to its new one (None: absent)
+    def track(self, before: Optional[ReportState], after: Optional[ReportState]) -> None:
+        with self._lock:
+            for state, sign in ((before, -1), (after, 1)):
+                if state is None:
+                    continue
+                team_id, is_open, priority, lat, lon = state
+                if is_open and team_id in self.teams:
+                    self.teams[team_id].add(priority, lat, lon, sign)
+
+
+workload = WorkloadIndex(ttl=settings.ASSIGNMENT_INDEX_TTL_SECONDS)
+
+
+def ensure_loaded(db) -> None:
+    if workload.needs_load():
+        workload.load(db.execute(workload_stmt()).all())
+
+
+async def ensure_loaded_async(db) -> None:
+    if workload.needs_load():
+        workload.load((await db.execute(workload_stmt())).all())
+
+
+def pick_team(db, priority: str, lat=None, lon=None) -> Optional[int]:
+    ensure_loaded(db)
+    return workload.pick(priority, lat, lon)
+
+
+async def pick_team_async(db, priority: str, lat=None, lon=None) -> Optional[int]:
+    await ensure_loaded_async(db)
+    return workload.pick(priority, lat, lon)
@@ -0,0 +1,103 @@
+# Streaming report exports (CSV / NDJSON) for NGO reporting
+#
+# Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE and are
+# written out as they arrive, so memory stays flat whatever the table size.
+
+import csv
+import io
+import json
+import re
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import Select, select
+
+from app.db.session import SessionLocal
+from app.models.report import Report
+from app.models.user import User
+from app.schemas.report import ExportFormat, ReportFilterBase
+from app.services import report_service
+
+EXPORT_BATCH_SIZE = 1000
+
+# photo columns (keys, legacy base64) are never exported
+EXPORT_COLUMNS = (
+    Report.id,
+    Report.reporter_id,
+    Report.condition,
+    Report.description,
+    Report.location,
+    Report.location_details,
+    Report.contact_name,
+    Report.contact_phone,
+    Report.latitude,
+    Report.longitude,
+    Report.status,
+    Report.priority,
+    Report.assigned_team_id,
+    User.full_name.label("assigned_team_name"),
+    Report.rescued_location,
+    Report.field_review,
+    Report.created_at,
+    Report.updated_at,
+)
+
+FIELDS = [c.key for c in EXPORT_COLUMNS]
+
+MEDIA_TYPES = {ExportFormat.csv: "text/csv", ExportFormat.ndjson: "application/x-ndjson"}
+
+
+def export_stmt(filters: ReportFilterBase) -> Select:
+    stmt = select(*EXPORT_COLUMNS).outerjoin(User, User.id == Report.assigned_team_id)
+    stmt = report_service.apply_filters(stmt, filters)
+    return stmt.order_by(Report.created_at.desc(), Report.id.desc()).execution_options(
+        yield_per=EXPORT_BATCH_SIZE
+    )
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+# phone numbers and signed numbers ("+91 98765 43210", "-12.5") stay as they
+# are: digits and separators alone cannot call functions or reference cells
+PLAIN_NUMBER = re.compile(r"[+-]?[\d\s().-]+")
+
+
+# text starting like a formula is prefixed so spreadsheets don't evaluate it
+def _cell(value):
+    value = _value(value)
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@") and not PLAIN_NUMBER.fullmatch(value):
+        return "'" + value
+    return value
+
+
+def _csv_chunks(partitions) -> Iterator[str]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(FIELDS)
+    for rows in partitions:
+        writer.writerows([_cell(v) for v in row] for row in rows)
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+    yield out.getvalue()
+
+
+def _ndjson_chunks(partitions) -> Iterator[str]:
+    for rows in partitions:
+        yield "".join(
+            json.dumps(dict(zip(FIELDS, map(_value, row))), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+
+# own session: the generator outlives the request's dependencies
+def export_reports(filters: ReportFilterBase, fmt: ExportFormat) -> Iterator[str]:
+    db = SessionLocal()
+    try:
+        partitions = db.execute(export_stmt(filters)).partitions()
+        chunks = _csv_chunks if fmt == ExportFormat.csv else _ndjson_chunks
+        yield from chunks(partitions)
+    finally:
+        db.close()
@@ -0,0 +1,199 @@
+# Content-addressed photo storage - report rows keep only the SHA-256 key
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Iterator, Optional
+
+from app.core.config import settings
+
+CHUNK_SIZE = 64 * 1024
+
+# uploads waiting for a background job are stored behind a random prefix so
+# each gets its own key: identical uploads would otherwise share one blob and
+# the first job to finish would delete it from under the others
+STAGED_NONCE_BYTES = 16
+
+
+class PhotoTooLargeError(ValueError):
+    pass
+
+
+@dataclass
+class StoredPhoto:
+    key: str
+    size: int
+
+
+# Stream the upload into a temp file in chunks, hashing as we go
+def _spool(stream: BinaryIO, directory: Optional[str], max_bytes: int):
+    digest = hashlib.sha256()
+    size = 0
+    tmp = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+    try:
+        with tmp:
+            while chunk := stream.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise PhotoTooLargeError(f"Photo exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                tmp.write(chunk)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    return tmp.name, digest.hexdigest(), size
+
+
+class PhotoStorage:
+    def save(self, stream: BinaryIO) -> StoredPhoto:
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    # raises FileNotFoundError when the blob is missing
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    # yield bytes start..end (inclusive), like an HTTP Range
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class LocalPhotoStorage(PhotoStorage):
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:])
+
+    def save(self, stream: BinaryIO) -> StoredPhoto:
+        tmp_path, key, size = _spool(stream, self.root, self.max_bytes)
+        path = self._path(key)
+
+        # identical photo already stored, keep the existing blob
+        if os.path.exists(path):
+            os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+
+        return StoredPhoto(key=key, size=size)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self._path(key))
+
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        remaining = end - start + 1
+        with open(self._path(key), "rb") as f:
+            f.seek(start)
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3PhotoStorage(PhotoStorage):
+    def __init__(self, bucket: str, prefix: str, endpoint_url: Optional[str], max_bytes: int):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("PHOTO_STORAGE_BACKEND=s3 requires the boto3 package") from e
+
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None)
+        self.bucket = bucket
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+
+    def _object(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def save(self, stream: BinaryIO) -> StoredPhoto:
+        tmp_path, key, size = _spool(stream, None, self.max_bytes)
+        try:
+            if not self.exists(key):
+                with open(tmp_path, "rb") as f:
+                    self.client.upload_fileobj(f, self.bucket, self._object(key))
+        finally:
+            os.unlink(tmp_path)
+
+        return StoredPhoto(key=key, size=size)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object(key))
+            return True
+        except self.client.exceptions.ClientError:
+            return False
+
+    def size(self, key: str) -> int:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._object(key))
+        except self.client.exceptions.ClientError as e:
+            raise FileNotFoundError(key) from e
+        return head["ContentLength"]
+
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        obj = self.client.get_object(
+            Bucket=self.bucket, Key=self._object(key), Range=f"bytes={start}-{end}"
+        )
+        yield from obj["Body"].iter_chunks(CHUNK_SIZE)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object(key))
+
+
+# the nonce, then the upload itself read in chunks (never held in memory whole)
+class _NoncePrefixed:
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.nonce = os.urandom(STAGED_NONCE_BYTES)
+
+    def read(self, size: int = -1) -> bytes:
+        if self.nonce:
+            chunk, self.nonce = self.nonce, b""
+            return chunk
+        return self.stream.read(size)
+
+
+# raises PhotoTooLargeError past PHOTO_MAX_BYTES
+def stage_upload(storage: PhotoStorage, stream: BinaryIO) -> str:
+    return storage.save(_NoncePrefixed(stream)).key
+
+
+def read_staged(storage: PhotoStorage, key: str) -> Optional[bytes]:
+    if not storage.exists(key):
+        return None
+    size = storage.size(key)
+    return b"".join(storage.iter_range(key, STAGED_NONCE_BYTES, size - 1))
+
+
+# one storage instance per process (staged uploads may carry the nonce on top of PHOTO_MAX_BYTES)
+@lru_cache
+def get_photo_storage() -> PhotoStorage:
+    if settings.PHOTO_STORAGE_BACKEND == "s3":
+        return S3PhotoStorage(
+            settings.PHOTO_S3_BUCKET,
+            settings.PHOTO_S3_PREFIX,
+            settings.PHOTO_S3_ENDPOINT_URL,
+            settings.PHOTO_MAX_BYTES + STAGED_NONCE_BYTES,
+        )
+    return LocalPhotoStorage(settings.PHOTO_STORAGE_DIR, settings.PHOTO_MAX_BYTES + STAGED_NONCE_BYTES)
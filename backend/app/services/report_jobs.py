@@ -0,0 +1,109 @@
+# Background work queued by the report routes (run by app.core.jobs)
+
+import io
+import json
+import urllib.request
+from typing import Optional
+
+from app.core import events, jobs
+from app.core.ai import analyze_image_for_description
+from app.core.config import settings
+from app.core.images import InvalidImageError, ingest_image
+from app.db.session import SessionLocal
+from app.models.report import Report
+from app.schemas.report import ReportSummary
+from app.services.photo_storage import get_photo_storage, read_staged
+
+
+# staged uploads never outlive their job
+def discard_upload(upload_key: str, **_) -> None:
+    get_photo_storage().delete(upload_key)
+
+
+# re-encode a report's staged upload, store it with its thumbnail and attach both
+@jobs.handler("process_photo", on_failure=discard_upload)
+def process_photo(report_id: int, upload_key: str) -> dict:
+    storage = get_photo_storage()
+
+    with SessionLocal() as db:
+        report = db.get(Report, report_id)
+        if report is None:  # deleted before we got to it
+            storage.delete(upload_key)
+            return {"skipped": "report deleted"}
+
+        data = read_staged(storage, upload_key)
+        if data is None:
+            # an earlier attempt got as far as removing the upload
+            if report.photo_key:
+                return {"photo_key": report.photo_key, "thumbnail_key": report.thumbnail_key}
+            raise jobs.PermanentJobError("Uploaded photo is missing")
+
+        try:
+            image = ingest_image(data)
+        except InvalidImageError as e:
+            raise jobs.PermanentJobError(str(e))
+
+        fields = {
+            "photo_key": storage.save(io.BytesIO(image.data)).key,
+            "photo_content_type": image.content_type,
+            "thumbnail_key": storage.save(io.BytesIO(image.thumbnail)).key,
+        }
+        for name, value in fields.items():
+            setattr(report, name, value)
+        db.commit()
+        db.refresh(report)
+        event = events.report_event("updated", report)
+
+    storage.delete(upload_key)
+    events.publish(event)
+    return fields
+
+
+# /reports/ai-analyze?background=true, the analysis is the job result
+@jobs.handler("analyze_photo", on_failure=discard_upload)
+def analyze_photo(upload_key: str) -> dict:
+    storage = get_photo_storage()
+    data = read_staged(storage, upload_key)
+    if data is None:
+        raise jobs.PermanentJobError("Uploaded photo is missing")
+
+    try:
+        # the model gets the downscaled image, not the phone original
+        image = ingest_image(data, with_thumbnail=False)
+    except InvalidImageError as e:
+        raise jobs.PermanentJobError(str(e))
+
+    result = analyze_image_for_description(image.data, mime_type=image.content_type)
+    storage.delete(upload_key)
+    return result
+
+
+# POST a summary of a new report to NOTIFY_WEBHOOK_URL (non 2xx -> retried)
+@jobs.handler("notify_report")
+def notify_report(report_id: int) -> dict:
+    with SessionLocal() as db:
+        report = db.get(Report, report_id)
+        if report is None:
+            return {"skipped": "report deleted"}
+        summary = ReportSummary.model_validate(report).model_dump(mode="json")
+
+    request = urllib.request.Request(
+        settings.NOTIFY_WEBHOOK_URL,
+        data=json.dumps({"event": "report.created", "report": summary}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=settings.NOTIFY_TIMEOUT_SECONDS) as response:
+        return {"status": response.status}
+
+
+# jobs for a newly created report; returns the photo job (None without a photo)
+def enqueue_report_jobs(report_id: int, upload_key: Optional[str], owner_id: int) -> Optional[jobs.JobRecord]:
+    photo_job = None
+    if upload_key:
+        photo_job = jobs.enqueue(
+            "process_photo", {"report_id": report_id, "upload_key": upload_key}, owner_id=owner_id
+        )
+    if settings.NOTIFY_WEBHOOK_URL:
+        jobs.enqueue("notify_report", {"report_id": report_id}, owner_id=owner_id)
+    return photo_job
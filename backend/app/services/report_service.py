@@ -0,0 +1,247 @@
+# Shared report queries - filtering and keyset pagination on (created_at, id)
+
+import base64
+import hashlib
+import heapq
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Select, func, literal, or_, select, tuple_
+from sqlalchemy.orm import joinedload, load_only
+
+from app.core import geo
+from app.core.config import settings
+from app.core.serialization import rows_as_dicts
+from app.models.report import Report, ReportStatus
+from app.models.user import User
+from app.schemas.report import (
+    NearbyReport,
+    ReportFilterBase,
+    ReportFilters,
+    ReportResponse,
+    ReportSummary,
+    ReportView,
+)
+
+# columns loaded for ReportSummary, heavy Text/photo columns are never selected
+SUMMARY_COLUMNS = (
+    Report.id,
+    Report.condition,
+    Report.location,
+    Report.status,
+    Report.priority,
+    Report.created_at,
+    Report.updated_at,
+    Report.assigned_team_id,
+    Report.thumbnail_key,
+)
+
+
+def encode_cursor(report: Report) -> str:
+    raw = f"{report.created_at.isoformat()}|{report.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, _, report_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        return datetime.fromisoformat(created_at), int(report_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# assigned team is joined in the same query so assigned_team_name/phone never lazy load
+def report_select(view: ReportView = ReportView.full) -> Select:
+    if view == ReportView.summary:
+        return select(Report).options(
+            load_only(*SUMMARY_COLUMNS),
+            joinedload(Report.assigned_team).load_only(User.full_name),
+        )
+
+    return select(Report).options(
+        joinedload(Report.assigned_team).load_only(User.full_name, User.phone)
+    )
+
+
+def get_report(db, report_id: int) -> Optional[Report]:
+    stmt = report_select().where(Report.id == report_id)
+    return db.execute(stmt).scalars().first()
+
+
+def schema_for(view: ReportView):
+    return ReportSummary if view == ReportView.summary else ReportResponse
+
+
+def serialize(rows: list, view: ReportView = ReportView.full) -> list:
+    return [schema_for(view).model_validate(r) for r in rows]
+
+
+# list payloads as plain dicts, sent with serialization.json_response
+def rows_content(rows: list, view: ReportView = ReportView.full) -> list:
+    return rows_as_dicts(schema_for(view), rows)
+
+
+def apply_filters(stmt: Select, filters: ReportFilterBase) -> Select:
+    if filters.status:
+        stmt = stmt.where(Report.status == filters.status.value)
+    if filters.priority:
+        stmt = stmt.where(Report.priority == filters.priority.value)
+    if filters.assigned_team_id is not None:
+        stmt = stmt.where(Report.assigned_team_id == filters.assigned_team_id)
+    if filters.created_from:
+        stmt = stmt.where(Report.created_at >= filters.created_from)
+    if filters.created_to:
+        stmt = stmt.where(Report.created_at <= filters.created_to)
+    return stmt
+
+
+# newest first; fetch one extra row to know if another page exists. The cursor
+# row's created_at is compared as stored (SQLite keeps server defaults as
+# "YYYY-MM-DD HH:MM:SS" text, which a bound datetime would not sort against);
+# the decoded value is only used if that row has since been deleted
+def apply_page(stmt: Select, limit: int, cursor: Optional[str]) -> Select:
+    if cursor:
+        created_at, report_id = decode_cursor(cursor)
+        stored = select(Report.created_at).where(Report.id == report_id).scalar_subquery()
+        after = func.coalesce(stored, literal(created_at, Report.created_at.type))
+        stmt = stmt.where(tuple_(Report.created_at, Report.id) < tuple_(after, report_id))
+    return stmt.order_by(Report.created_at.desc(), Report.id.desc()).limit(limit + 1)
+
+
+# ReportPage / ReportSummaryPage content
+def build_page(rows: list, limit: int, view: ReportView = ReportView.full) -> dict:
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return {"items": rows_content(rows[:limit], view), "next_cursor": next_cursor}
+
+
+# statements are shared by the sync Session and AsyncSession routes
+def list_reports_stmt(filters: ReportFilters, reporter_id: Optional[int] = None) -> Select:
+    stmt = apply_filters(report_select(filters.view), filters)
+    if reporter_id is not None:
+        stmt = stmt.where(Report.reporter_id == reporter_id)
+    return apply_page(stmt, filters.limit, filters.cursor)
+
+
+def assignments_stmt(team_id: int, view: ReportView = ReportView.full) -> Select:
+    return report_select(view).where(Report.assigned_team_id == team_id)
+
+
+def list_reports(db, filters: ReportFilters, reporter_id: Optional[int] = None) -> list:
+    return db.execute(list_reports_stmt(filters, reporter_id)).scalars().all()
+
+
+def list_assignments(db, team_id: int, view: ReportView = ReportView.full) -> list:
+    return db.execute(assignments_stmt(team_id, view)).scalars().all()
+
+
+# validators for conditional GETs, computed without loading the report rows
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _micros(value: Optional[datetime]) -> int:
+    return int(as_utc(value).timestamp() * 1_000_000) if value else 0
+
+
+# primary key lookup of the columns an access check and ETag need
+def validators_stmt(report_id: int) -> Select:
+    return select(Report.id, Report.reporter_id, Report.updated_at).where(Report.id == report_id)
+
+
+def report_etag(report) -> str:
+    return f'W/"{report.id}-{_micros(report.updated_at)}"'
+
+
+# tag of a list response from the rows it is built from (including the extra
+# row that decides next_cursor): any create, update or delete that changes
+# what the page shows changes an id or an updated_at. Computed from the page
+# query itself, so validators cost no extra statement, let alone a table scan.
+# The page shape (view, cursor, limit...) is part of the tag
+def list_etag(rows, *variant) -> str:
+    raw = repr(([(r.id, _micros(r.updated_at)) for r in rows], variant)).encode()
+    return f'W/"{hashlib.sha1(raw).hexdigest()[:20]}"'
+
+
+# nearby lookups: geo_cell ranges narrow the search through the index, exact
+# distances are computed on that small candidate set (or by PostGIS)
+
+NEARBY_COLUMNS = SUMMARY_COLUMNS + (Report.latitude, Report.longitude)
+
+# radii tried in turn when looking for the nearest reports
+NEAREST_RADII_KM = (5, 20, 50, 100)
+
+
+# matches the GiST index created by app.db.migrate when GEO_INDEX=postgis
+def geography(lon, lat):
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326))
+
+
+def nearby_select(unassigned: bool = False) -> Select:
+    stmt = select(Report).options(
+        load_only(*NEARBY_COLUMNS),
+        joinedload(Report.assigned_team).load_only(User.full_name),
+    )
+    if unassigned:
+        stmt = stmt.where(
+            Report.assigned_team_id.is_(None), Report.status != ReportStatus.resolved.value
+        )
+    return stmt
+
+
+def _grid_nearby(db, lat: float, lon: float, radius_km: float, limit: int, unassigned: bool):
+    cells = or_(*(Report.geo_cell.between(a, b) for a, b in geo.cell_ranges(lat, lon, radius_km)))
+
+    # rank plain tuples, only the closest `limit` become Report objects; the
+    # unassigned filter is applied here so the planner always uses the geo_cell index
+    candidates = select(
+        Report.id, Report.latitude, Report.longitude, Report.assigned_team_id, Report.status
+    ).where(cells)
+
+    distances = {}
+    for report_id, report_lat, report_lon, team_id, status in db.execute(candidates):
+        if unassigned and (team_id is not None or status == ReportStatus.resolved.value):
+            continue
+        # float(): legacy SQLite tables keep TEXT affinity on these columns
+        distance = geo.haversine_km(lat, lon, float(report_lat), float(report_lon))
+        if distance <= radius_km:
+            distances[report_id] = distance
+
+    closest = heapq.nsmallest(limit, distances, key=distances.get)
+    reports = db.execute(nearby_select().where(Report.id.in_(closest))).scalars().all()
+    return sorted(((r, distances[r.id]) for r in reports), key=lambda row: row[1])
+
+
+def _postgis_nearby(db, lat: float, lon: float, radius_km: float, limit: int, unassigned: bool):
+    column, point = geography(Report.longitude, Report.latitude), geography(lon, lat)
+    distance = (func.ST_Distance(column, point) / 1000).label("distance_km")
+    stmt = (
+        nearby_select(unassigned)
+        .add_columns(distance)
+        .where(func.ST_DWithin(column, point, radius_km * 1000))
+        .order_by(distance)
+        .limit(limit)
+    )
+    return db.execute(stmt).all()
+
+
+def nearby_reports(
+    db, lat: float, lon: float, radius_km: float, limit: int = 50, unassigned: bool = False
+) -> list:
+    search = _postgis_nearby if settings.GEO_INDEX == "postgis" else _grid_nearby
+    return [
+        NearbyReport.model_validate(report).model_copy(update={"distance_km": round(distance, 3)})
+        for report, distance in search(db, lat, lon, radius_km, limit, unassigned)
+    ]
+
+
+# open unassigned reports closest to (lat, lon), widening the radius until enough are found
+def nearest_unassigned(db, lat: float, lon: float, limit: int = 10) -> list:
+    for radius_km in NEAREST_RADII_KM:
+        reports = nearby_reports(db, lat, lon, radius_km, limit, unassigned=True)
+        if len(reports) >= limit:
+            break
+    return reports
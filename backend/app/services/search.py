@@ -0,0 +1,161 @@
+# Full-text search over reports
+#
+# PostgreSQL: reports.search_vector, a stored generated tsvector (condition >
+# location > description > field_review) with a GIN index.
+# SQLite: reports_fts, an external content FTS5 table kept in sync by triggers.
+# Both are created by app.db.migrate (SQLite also on first search).
+
+import base64
+import re
+import threading
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import column, func, inspect, literal_column, table, text
+from sqlalchemy.orm import Session
+
+from app.models.report import Report
+from app.schemas.report import ReportSummaryPage, ReportView
+from app.services import report_service
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(condition, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(field_review, '')), 'D')"
+)
+
+FTS_COLUMNS = "condition, location, description, field_review"
+
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE reports_fts USING fts5({FTS_COLUMNS}, content='reports', content_rowid='id')",
+    f"""CREATE TRIGGER reports_fts_insert AFTER INSERT ON reports BEGIN
+        INSERT INTO reports_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.condition, new.location, new.description, new.field_review);
+    END""",
+    f"""CREATE TRIGGER reports_fts_delete AFTER DELETE ON reports BEGIN
+        INSERT INTO reports_fts(reports_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.condition, old.location, old.description, old.field_review);
+    END""",
+    f"""CREATE TRIGGER reports_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON reports BEGIN
+        INSERT INTO reports_fts(reports_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.condition, old.location, old.description, old.field_review);
+        INSERT INTO reports_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.condition, new.location, new.description, new.field_review);
+    END""",
+    # index the rows that existed before the table
+    "INSERT INTO reports_fts(reports_fts) VALUES ('rebuild')",
+]
+
+reports_fts = table("reports_fts", column("rowid"))
+
+# per database: search_vector present (PostgreSQL) / reports_fts ensured (SQLite)
+_prepared = {}
+_lock = threading.Lock()
+
+
+def ensure_search_index(conn) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(
+            "ALTER TABLE reports ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_reports_search_vector ON reports USING gin (search_vector)"
+        ))
+
+    elif conn.dialect.name == "sqlite":
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reports_fts'")
+        ).first()
+        if not exists:
+            for ddl in SQLITE_DDL:
+                conn.execute(text(ddl))
+
+
+# checked once per process, restart workers after migrating
+def _has_search_vector(db: Session) -> bool:
+    bind = db.get_bind()
+    if bind.url not in _prepared:
+        columns = {c["name"] for c in inspect(bind).get_columns("reports")}
+        _prepared[bind.url] = "search_vector" in columns
+    return _prepared[bind.url]
+
+
+def _ensure_sqlite_fts(db: Session) -> None:
+    bind = db.get_bind()
+    if bind.url in _prepared:
+        return
+    with _lock:
+        if bind.url not in _prepared:
+            with bind.begin() as conn:
+                ensure_search_index(conn)
+            _prepared[bind.url] = True
+
+
+def encode_offset(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"rank|{offset}".encode()).decode()
+
+
+def decode_offset(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        kind, _, offset = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        if kind != "rank":
+            raise ValueError
+        return int(offset)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _postgres_search(db: Session, q: str):
+    # websearch syntax: quotes for phrases, "or", -excluded; never a syntax error
+    query = func.websearch_to_tsquery(literal_column("'english'::regconfig"), q)
+    vector = (
+        literal_column("reports.search_vector")
+        if _has_search_vector(db)
+        else literal_column(f"({SEARCH_VECTOR_SQL})")  # not migrated yet: unindexed
+    )
+    rank = func.ts_rank_cd(vector, query)
+    return vector.op("@@")(query), rank.desc()
+
+
+def _sqlite_search(db: Session, q: str):
+    _ensure_sqlite_fts(db)
+    # every word must match; quoting keeps FTS5 operators in user input literal
+    terms = " ".join(f'"{word}"' for word in re.findall(r"\w+", q))
+    match = literal_column("reports_fts").op("MATCH")(terms)
+    # bm25: lower is better, weights follow the column order
+    rank = func.bm25(literal_column("reports_fts"), 4.0, 3.0, 2.0, 1.0)
+    return match, rank.asc()
+
+
+def search_reports(
+    db: Session, q: str, limit: int, cursor: Optional[str] = None, reporter_id: Optional[int] = None
+) -> ReportSummaryPage:
+    offset = decode_offset(cursor)
+
+    if db.get_bind().dialect.name == "sqlite":
+        if not re.search(r"\w", q):
+            return ReportSummaryPage(items=[])
+        match, order = _sqlite_search(db, q)
+        stmt = report_service.report_select(ReportView.summary).join(
+            reports_fts, reports_fts.c.rowid == Report.id
+        )
+    else:
+        match, order = _postgres_search(db, q)
+        stmt = report_service.report_select(ReportView.summary)
+
+    stmt = stmt.where(match)
+    if reporter_id is not None:
+        stmt = stmt.where(Report.reporter_id == reporter_id)
+
+    rows = db.execute(
+        stmt.order_by(order, Report.id.desc()).offset(offset).limit(limit + 1)
+    ).scalars().all()
+
+    return ReportSummaryPage(
+        items=report_service.serialize(rows[:limit], ReportView.summary),
+        next_cursor=encode_offset(offset + limit) if len(rows) > limit else None,
+    )
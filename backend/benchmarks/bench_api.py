@@ -0,0 +1,367 @@
+# End-to-end API benchmark: seeds a throwaway database, stubs Gemini and drives
+# the app in-process through httpx's ASGI transport at fixed concurrency levels.
+# Reports throughput, p50/p95/p99 latency, SQL statements per request and worker
+# memory per scenario, and compares them against a stored baseline.
+#
+# Run from backend/:
+#   python -m benchmarks.bench_api [--users N] [--reports N] [--concurrency 1,8,32]
+#   python -m benchmarks.bench_api --save-baseline      # write benchmarks/baseline.json
+#   python -m benchmarks.bench_api --compare            # exit 1 on a regression
+#   python -m benchmarks.bench_api --database-url postgresql+pg8000://...   # Postgres stand-in
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PASSWORD = "bench-password"
+CONDITIONS = ["Injured", "Sick", "Lost", "Stranded", "Abandoned"]
+PRIORITIES = ["low", "medium", "high"]
+
+
+def configure(args) -> str:
+    # settings are read at import time, so the environment is set before app imports
+    workdir = tempfile.mkdtemp(prefix="kindsteps-bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.db"
+    os.environ["PHOTO_STORAGE_DIR"] = os.path.join(workdir, "photos")
+    os.environ["GEMINI_API_KEY"] = "bench"  # any value: the client is stubbed
+    os.environ.setdefault("JOBS_BACKEND", "memory")
+    os.environ.setdefault("SLOW_QUERY_MS", "0")
+    return workdir
+
+
+def jpeg(seed: int, size=(1200, 900)) -> bytes:
+    from PIL import Image
+
+    rng = random.Random(seed)
+    img = Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3)))
+    # a few random blocks so every photo hashes (and caches) differently
+    for _ in range(8):
+        x, y = rng.randrange(size[0] - 100), rng.randrange(size[1] - 100)
+        img.paste(tuple(rng.randrange(256) for _ in range(3)), (x, y, x + 100, y + 100))
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=85)
+    return out.getvalue()
+
+
+# Gemini stand-in: fixed latency, canned JSON
+class FakeModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, **_):
+        time.sleep(self.latency)
+        return FakeResponse()
+
+
+class FakeAsyncModels(FakeModels):
+    async def generate_content(self, **_):
+        await asyncio.sleep(self.latency)
+        return FakeResponse()
+
+
+class FakeResponse:
+    text = json.dumps({"description": "Dog with an injured leg", "advice": ["Keep it calm"], "condition": "Injured"})
+
+
+class FakeClient:
+    def __init__(self, latency: float):
+        self.models = FakeModels(latency)
+        self.aio = type("Aio", (), {"models": FakeAsyncModels(latency)})()
+
+
+def seed(users: int, reports: int, teams: int, photo_ratio: float) -> dict:
+    from sqlalchemy import insert
+
+    import app.db.base  # noqa: registers every model
+    from app.core import geo
+    from app.core.images import ingest_image
+    from app.core.security import hash_password
+    from app.db.session import Base, SessionLocal, get_engine
+    from app.models.report import Report
+    from app.models.user import User, UserRole
+    from app.services.photo_storage import get_photo_storage
+
+    Base.metadata.create_all(bind=get_engine())
+    hashed = hash_password(PASSWORD)  # one hash shared by every seeded account
+    rng = random.Random(42)
+
+    rows = [dict(full_name="Bench Admin", email="admin@bench.kindsteps.org", role=UserRole.admin, hashed_password=hashed, phone="0")]
+    rows += [
+        dict(full_name=f"Team {i}", email=f"team{i}@bench.kindsteps.org", role=UserRole.rescue_team, hashed_password=hashed, phone="0")
+        for i in range(teams)
+    ]
+    rows += [
+        dict(full_name=f"User {i}", email=f"user{i}@bench.kindsteps.org", role=UserRole.user, hashed_password=hashed, phone="0")
+        for i in range(users)
+    ]
+
+    storage = get_photo_storage()
+    photos = []
+    for i in range(min(20, reports)):
+        image = ingest_image(jpeg(i))
+        photos.append((
+            storage.save(io.BytesIO(image.data)).key,
+            image.content_type,
+            storage.save(io.BytesIO(image.thumbnail)).key,
+        ))
+
+    with SessionLocal() as db:
+        db.execute(insert(User), rows)
+        db.commit()
+        team_ids = [t for (t,) in db.query(User.id).filter(User.role == UserRole.rescue_team)]
+        user_ids = [u for (u,) in db.query(User.id).filter(User.role == UserRole.user)]
+
+        batch = []
+        for n in range(reports):
+            lat, lon = 12.9 + rng.gauss(0, 0.3), 77.6 + rng.gauss(0, 0.3)
+            report = dict(
+                reporter_id=rng.choice(user_ids),
+                condition=rng.choice(CONDITIONS),
+                description="Found near the market, needs help. " * rng.randint(1, 10),
+                location=f"Street {n}",
+                contact_name="Bench",
+                contact_phone="0",
+                latitude=lat,
+                longitude=lon,
+                geo_cell=geo.cell_for(lat, lon),
+                status=rng.choice(["received", "in_progress", "active", "resolved"]),
+                priority=rng.choice(PRIORITIES),
+                assigned_team_id=rng.choice(team_ids) if team_ids and rng.random() < 0.8 else None,
+            )
+            if photos and rng.random() < photo_ratio:
+                report["photo_key"], report["photo_content_type"], report["thumbnail_key"] = rng.choice(photos)
+            batch.append(report)
+            if len(batch) == 1000:
+                db.execute(insert(Report), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Report), batch)
+        db.commit()
+        report_ids = [r for (r,) in db.query(Report.id)]
+
+    return {"users": len(user_ids), "report_ids": report_ids}
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:  # not Linux: peak RSS instead
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+async def drive(client, call: Callable, requests: int, concurrency: int, queries: list) -> dict:
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            response = await call(client, i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    memory_before, queries_before = rss_mb(), queries[0]
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "queries_per_request": round((queries[0] - queries_before) / requests, 2),
+        "rss_mb": round(rss_mb(), 1),
+        "rss_delta_mb": round(rss_mb() - memory_before, 1),
+    }
+
+
+def scenarios(tokens: Dict[str, str], data: dict, photos: List[bytes]) -> Dict[str, Callable]:
+    rng = random.Random(7)
+    admin = {"Authorization": f"Bearer {tokens['admin']}"}
+    user = {"Authorization": f"Bearer {tokens['user']}"}
+    report_ids = data["report_ids"]
+
+    def form(i):
+        return {
+            "condition": rng.choice(CONDITIONS),
+            "description": "Benchmark report, animal needs help near the bus stop.",
+            "location": f"Bench street {i}",
+            "contact_name": "Bench",
+            "contact_phone": "0",
+            "priority": rng.choice(PRIORITIES),
+            "latitude": str(12.9 + rng.gauss(0, 0.3)),
+            "longitude": str(77.6 + rng.gauss(0, 0.3)),
+        }
+
+    return {
+        "login": lambda c, i: c.post(
+            "/auth/login", data={"username": f"user{i % data['users']}@bench.kindsteps.org", "password": PASSWORD}
+        ),
+        "create_report": lambda c, i: c.post("/reports/", data=form(i), headers=user),
+        "create_report_photo": lambda c, i: c.post(
+            "/reports/", data=form(i), files={"photo": ("p.jpg", photos[i % len(photos)], "image/jpeg")}, headers=user
+        ),
+        "list_reports": lambda c, i: c.get("/reports/", params={"limit": 50}, headers=admin),
+        "get_report": lambda c, i: c.get(f"/reports/{rng.choice(report_ids)}", headers=admin),
+        "admin_stats": lambda c, i: c.get("/admin/stats", headers=admin),
+        "admin_reports": lambda c, i: c.get("/admin/reports", params={"limit": 50}, headers=admin),
+        "ai_analyze": lambda c, i: c.post(
+            "/reports/ai-analyze", files={"photo": ("p.jpg", photos[i % len(photos)], "image/jpeg")}, headers=user
+        ),
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+    from sqlalchemy import event
+
+    from app.core import ai, jobs
+    from app.db.session import get_engine
+    from app.main import app
+
+    ai.get_client = lambda: FakeClient(args.ai_latency_ms / 1000)
+
+    data = seed(args.users, args.reports, args.teams, args.photo_ratio)
+    photos = [jpeg(1000 + i) for i in range(args.requests)]
+
+    queries = [0]
+
+    @event.listens_for(get_engine(), "after_cursor_execute")
+    def count(*_):
+        queries[0] += 1
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            tokens = {}
+            for role, email in (("admin", "admin@bench.kindsteps.org"), ("user", "user0@bench.kindsteps.org")):
+                response = await client.post("/auth/login", data={"username": email, "password": PASSWORD})
+                response.raise_for_status()
+                tokens[role] = response.json()["access_token"]
+
+            selected = scenarios(tokens, data, photos)
+            for name in args.scenarios or selected:
+                for concurrency in args.concurrency:
+                    # caches (stats, principals, AI results) are part of what is measured
+                    await drive(client, selected[name], min(10, args.requests), concurrency, queries)
+                    if name == "ai_analyze":  # the warm-up photos come round again
+                        ai.memory_cache.invalidate()
+                    results[f"{name}@{concurrency}"] = await drive(
+                        client, selected[name], args.requests, concurrency, queries
+                    )
+                    # photo jobs left behind would be charged to the next scenario
+                    while await asyncio.to_thread(jobs.pending):
+                        await asyncio.sleep(0.05)
+                    print_row(name, concurrency, results[f"{name}@{concurrency}"])
+    return results
+
+
+def print_header():
+    print(f"{'scenario':<22}{'conc':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'q/req':>7}{'rss MB':>8}{'errors':>7}")
+
+
+def print_row(name: str, concurrency: int, r: dict):
+    print(f"{name:<22}{concurrency:>5}{r['throughput']:9.1f}{r['p50_ms']:9.2f}{r['p95_ms']:9.2f}"
+          f"{r['p99_ms']:9.2f}{r['queries_per_request']:7.2f}{r['rss_mb']:8.1f}{r['errors']:7d}")
+
+
+def environment(args) -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "database": "postgresql" if args.database_url else "sqlite",
+        "users": args.users,
+        "reports": args.reports,
+        "teams": args.teams,
+        "photo_ratio": args.photo_ratio,
+        "requests": args.requests,
+        "ai_latency_ms": args.ai_latency_ms,
+    }
+
+
+# slower p95 or lower throughput than the baseline by more than `tolerance`
+def compare(baseline: dict, current: dict, tolerance: float) -> List[str]:
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline["results"].get(key)
+        if not before:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{key}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+        if now["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {before['throughput']} -> {now['throughput']} req/s")
+        if now["queries_per_request"] > before["queries_per_request"] + 0.5:
+            regressions.append(
+                f"{key}: queries/request {before['queries_per_request']} -> {now['queries_per_request']}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--reports", type=int, default=5000)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--photo-ratio", type=float, default=0.3, help="share of seeded reports with a photo")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and concurrency level")
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in v.split(",")], default=[1, 8, 32])
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=None)
+    parser.add_argument("--ai-latency-ms", type=float, default=300, help="latency of the Gemini stub")
+    parser.add_argument("--database-url", default=None, help="benchmark against this database instead of SQLite")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE, default=None)
+    parser.add_argument("--compare", nargs="?", const=BASELINE, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    configure(args)
+    print(f"users={args.users} reports={args.reports} photos={args.photo_ratio:.0%} requests={args.requests}")
+    print_header()
+    current = {"environment": environment(args), "results": asyncio.run(run(args))}
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"baseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["environment"] != current["environment"]:
+            print("warning: baseline was recorded with a different setup:", baseline["environment"])
+        regressions = compare(baseline, current, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+        print("no regressions against", args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Assignment policies on a synthetic report stream: pick latency, workload spread
+# and distance from each report to the area its team is working in
+# Run from backend/: python -m benchmarks.bench_assignment [--teams N] [--reports N]
+
+import argparse
+import random
+import statistics
+import time
+
+# city clusters reports are drawn around (lat, lon)
+CITIES = [(12.97, 77.59), (28.61, 77.21), (19.08, 72.88), (13.08, 80.27), (22.57, 88.36)]
+PRIORITIES = ["low", "medium", "medium", "high"]
+
+
+def report_stream(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        lat = lon = None
+        if rng.random() < 0.8:
+            city_lat, city_lon = rng.choice(CITIES)
+            lat, lon = city_lat + rng.gauss(0, 0.1), city_lon + rng.gauss(0, 0.1)
+        yield rng.choice(PRIORITIES), lat, lon
+
+
+def run(policy: str, teams: int, reports: int, resolve_every: int):
+    from app.core import geo
+    from app.services.assignment import WorkloadIndex
+
+    index = WorkloadIndex(ttl=float("inf"))
+    index.load((team_id, 0, 0, 0, 0.0, 0.0) for team_id in range(1, teams + 1))
+
+    open_reports, latencies, distances = [], [], []
+    for n, (priority, lat, lon) in enumerate(report_stream(reports)):
+        start = time.perf_counter()
+        team_id = index.pick(priority, lat, lon, policy=policy)
+        latencies.append(time.perf_counter() - start)
+
+        centroid = index.teams[team_id].centroid()
+        if centroid and lat is not None:
+            distances.append(geo.haversine_km(lat, lon, *centroid))
+        open_reports.append((team_id, True, priority, lat, lon))
+
+        # teams close the oldest open report now and then
+        if n % resolve_every == 0 and open_reports:
+            state = open_reports.pop(0)
+            index.track(state, (*state[:1], False, *state[2:]))
+
+    weights = [load.weight for load in index.teams.values()]
+    latencies.sort()
+    return {
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+        "weight_min": min(weights),
+        "weight_max": max(weights),
+        "weight_stdev": statistics.pstdev(weights),
+        "distance_km": statistics.mean(distances) if distances else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--reports", type=int, default=20_000)
+    parser.add_argument("--resolve-every", type=int, default=2)
+    args = parser.parse_args()
+
+    from app.services.assignment import POLICIES
+
+    print(f"teams={args.teams} reports={args.reports}")
+    print(f"{'policy':<14}{'p50 us':>9}{'p99 us':>9}{'min w':>8}{'max w':>8}{'stdev':>8}{'km to area':>12}")
+    for policy in POLICIES:
+        r = run(policy, args.teams, args.reports, args.resolve_every)
+        print(
+            f"{policy:<14}{r['p50_us']:9.1f}{r['p99_us']:9.1f}{r['weight_min']:8d}"
+            f"{r['weight_max']:8d}{r['weight_stdev']:8.1f}{r['distance_km']:12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
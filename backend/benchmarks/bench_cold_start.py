@@ -0,0 +1,176 @@
+# Serverless cold start: import cost per module and a cold start budget check.
+#
+# Every run is a fresh interpreter configured like the Vercel lambda (VERCEL=1,
+# throwaway SQLite database). A run imports app.main, enters the app lifespan
+# and serves one request, timing each phase, then lists the modules it loaded.
+#
+# Run from backend/:
+#   python -m benchmarks.bench_cold_start                    # import profile + cold start runs
+#   python -m benchmarks.bench_cold_start --budget-ms 1500   # exit 1 when the median run is slower (default 2000)
+#   python -m benchmarks.bench_cold_start --path /auth/me --top 40
+#
+# --forbid lists modules that must not be loaded by the first request (default:
+# the Gemini SDK and passlib, both only needed by specific routes); loading one
+# fails the check whatever the timings.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FORBID = ["google.genai", "passlib"]
+
+# runs inside the fresh interpreter; prints one JSON line
+CHILD = r"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def first_request(app, path):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 1), "server": ("localhost", 80),
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        await app(scope, receive, send)
+        return ready, time.perf_counter(), status[0]
+
+ready, served, status = asyncio.run(first_request(app.main.app, sys.argv[1]))
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "request_ms": (served - ready) * 1000,
+    "status": status,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def child_env(workdir: str) -> dict:
+    env = dict(os.environ)
+    env.update(
+        VERCEL="1",
+        DATABASE_URL=f"sqlite:///{workdir}/cold.db",
+        PHOTO_STORAGE_DIR=os.path.join(workdir, "photos"),
+        GEMINI_API_KEY=env.get("GEMINI_API_KEY") or "cold-start",
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    return env
+
+
+def cold_start(path: str, env: dict) -> dict:
+    began = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, path], cwd=BACKEND, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    # process wall time: interpreter start up to the response
+    result["wall_ms"] = (time.perf_counter() - began) * 1000
+    return result
+
+
+# "import time: self [us] | cumulative | imported package" lines of -X importtime
+def import_profile(env: dict) -> List[dict]:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return rows
+
+
+def print_profile(rows: List[dict], top: int) -> None:
+    packages: Dict[str, float] = defaultdict(float)
+    for row in rows:
+        packages[row["module"].split(".")[0]] += row["self_ms"]
+    total = sum(packages.values())
+
+    print(f"import app.main: {total:.0f} ms in {len(rows)} modules\n")
+    print(f"{'package':30} {'self ms':>9} {'share':>7}")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{name:30} {ms:9.1f} {ms / total:7.1%}")
+
+    print(f"\n{'module':50} {'self ms':>9} {'cum ms':>9}")
+    for row in sorted(rows, key=lambda r: -r["self_ms"])[:top]:
+        print(f"{row['module']:50} {row['self_ms']:9.1f} {row['cumulative_ms']:9.1f}")
+
+    print(f"\n{'app module':50} {'self ms':>9} {'cum ms':>9}")
+    app_rows = [r for r in rows if r["module"] == "app" or r["module"].startswith("app.")]
+    for row in sorted(app_rows, key=lambda r: -r["cumulative_ms"])[:top]:
+        print(f"{row['module']:50} {row['self_ms']:9.1f} {row['cumulative_ms']:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to time")
+    parser.add_argument("--path", default="/health", help="route served as the first request")
+    parser.add_argument("--top", type=int, default=25, help="rows per import profile table")
+    parser.add_argument("--no-profile", action="store_true", help="skip the import profile")
+    parser.add_argument("--budget-ms", type=float, default=2000,
+                        help="fail when the median import + startup + first request exceeds this")
+    parser.add_argument("--forbid", type=lambda v: [m for m in v.split(",") if m], default=FORBID,
+                        help="modules the first request must not load (comma separated)")
+    args = parser.parse_args()
+
+    env = child_env(tempfile.mkdtemp(prefix="kindsteps-cold-"))
+
+    if not args.no_profile:
+        print_profile(import_profile(env), args.top)
+        print()
+
+    runs = [cold_start(args.path, env) for _ in range(args.runs)]
+    print(f"GET {args.path} -> {runs[0]['status']}, {args.runs} cold starts (VERCEL=1)")
+    print(f"{'phase':12} {'median ms':>10} {'max ms':>9}")
+    for phase in ("import_ms", "startup_ms", "request_ms", "wall_ms"):
+        values = [run[phase] for run in runs]
+        print(f"{phase[:-3]:12} {statistics.median(values):10.1f} {max(values):9.1f}")
+
+    failures = []
+    cold = statistics.median(r["import_ms"] + r["startup_ms"] + r["request_ms"] for r in runs)
+    if cold > args.budget_ms:
+        failures.append(f"cold start {cold:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    loaded = set(runs[0]["modules"])
+    for module in args.forbid:
+        if module in loaded:
+            failures.append(f"{module} is imported before the first response")
+
+    print(f"\ncold start (import + startup + first request): {cold:.1f} ms")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
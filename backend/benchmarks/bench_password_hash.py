@@ -0,0 +1,47 @@
+# Password hashing throughput: hashes/sec inline and through the process pool
+# Run from backend/: python -m benchmarks.bench_password_hash [--rounds N] [--hashes N]
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def measure(fn, hashes: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        list(threads.map(fn, [f"password-{i}" for i in range(hashes)]))
+    return hashes / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=None, help="PASSWORD_HASH_ROUNDS to benchmark")
+    parser.add_argument("--hashes", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.rounds:
+        os.environ["PASSWORD_HASH_ROUNDS"] = str(args.rounds)
+
+    from app.core import security
+    from app.core.config import settings
+    from app.core.executors import shutdown_pools
+
+    cores = os.cpu_count() or 1
+    print(f"pbkdf2_sha256 rounds={settings.PASSWORD_HASH_ROUNDS} cores={cores}")
+
+    # inline: every hash holds the GIL of the calling worker
+    settings.PASSWORD_HASH_WORKERS = 0
+    rate = measure(security.hash_password, args.hashes, cores)
+    print(f"inline         {rate:8.1f} hashes/s")
+
+    for workers in sorted({1, cores // 2 or 1, cores}):
+        settings.PASSWORD_HASH_WORKERS = workers
+        security.run_in_pool("passwords", workers, security._hash, "warm up")
+        rate = measure(security.hash_password, args.hashes, workers * 2)
+        print(f"pool x{workers:<3}       {rate:8.1f} hashes/s  ({rate / workers:.1f} per core)")
+        shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# Report/user list serialization and bytes on the wire.
+#
+# "pydantic" is the previous path: rows validated into ReportResponse models,
+# then validated against the route's response_model and dumped by FastAPI.
+# "orjson" is what the list routes do now: rows_as_dicts + FastJSONResponse.
+# Both outputs are checked to decode to the same JSON. Sizes are given raw and
+# compressed as CompressionMiddleware would send them (br only with brotli).
+#
+# Run from backend/:
+#   python -m benchmarks.bench_serialization [--sizes 50,200,1000,5000] [--rounds 20]
+
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Union
+
+WORDS = (
+    "dog cat puppy kitten injured leg paw limping bleeding hungry thin scared near park road "
+    "bridge market school gate drain stuck under car shop corner behind temple bus stop calm "
+    "friendly cannot walk eye wound collar lost stray rain shelter water food vet needed quickly "
+    "team arrived picked up taken to clinic treated stitches recovering well adopted released "
+    "volunteer fostering checked again healthy fed vaccinated"
+).split()
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_reports(count: int) -> list:
+    import app.db.base  # noqa: registers every model
+    from app.models.report import Report
+    from app.models.user import User, UserRole
+
+    rng = random.Random(7)
+    teams = [User(id=100 + i, full_name=f"Rescue Team {i}", phone=f"555-01{i:02d}", role=UserRole.rescue_team) for i in range(10)]
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    reports = []
+    for i in range(count):
+        created = now - timedelta(minutes=7 * i)
+        team = rng.choice(teams) if rng.random() < 0.6 else None
+        reports.append(Report(
+            id=count - i,
+            reporter_id=rng.randrange(1, 500),
+            condition=rng.choice(["Injured", "Sick", "Lost", "Stranded", "Abandoned"]),
+            description=text(rng, rng.randrange(20, 80)),
+            location=f"{rng.randrange(1, 300)} {rng.choice(['Park', 'Market', 'Station'])} Road",
+            location_details=text(rng, 8) if rng.random() < 0.3 else None,
+            contact_name=f"Reporter {rng.randrange(1000)}",
+            contact_phone=f"+91 98{rng.randrange(10**8):08d}",
+            photo_key=f"{rng.getrandbits(256):064x}" if rng.random() < 0.4 else None,
+            thumbnail_key=f"{rng.getrandbits(256):064x}" if rng.random() < 0.4 else None,
+            status=rng.choice(["received", "active", "in_progress", "resolved"]),
+            priority=rng.choice(["low", "medium", "high"]),
+            created_at=created,
+            updated_at=created + timedelta(minutes=rng.randrange(60)),
+            assigned_team_id=team.id if team else None,
+            assigned_team=team,
+            rescued_location=text(rng, 4) if rng.random() < 0.3 else None,
+            latitude=12.9 + rng.random() / 10,
+            longitude=77.5 + rng.random() / 10,
+            field_review=text(rng, rng.randrange(10, 60)) if rng.random() < 0.3 else None,
+        ))
+    return reports
+
+
+def make_users(count: int) -> list:
+    from app.models.user import User, UserRole
+
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        User(id=i, full_name=f"User {i}", email=f"user{i}@kindsteps.org", phone=f"555-{i:04d}",
+             role=UserRole.user if i % 10 else UserRole.rescue_team, created_at=created)
+        for i in range(1, count + 1)
+    ]
+
+
+def timed(fn: Callable[[], bytes], rounds: int):
+    fn()
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, out
+
+
+def compressed_sizes(body: bytes) -> List[str]:
+    from app.core import compression
+    from app.core.config import settings
+
+    cells = [f"{len(gzip.compress(body, settings.COMPRESSION_GZIP_LEVEL)):>10}"]
+    if compression.brotli is not None:
+        cells.append(f"{len(compression.brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)):>10}")
+    return cells
+
+
+def compress_ms(body: bytes) -> float:
+    from app.core import compression
+
+    compress, _, finish = compression.compressor(compression.supported()[0])
+    start = time.perf_counter()
+    compress(body) + finish()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=lambda v: [int(s) for s in v.split(",")], default=[50, 200, 1000, 5000])
+    parser.add_argument("--rounds", type=int, default=20, help="best of N per measurement")
+    args = parser.parse_args()
+
+    from pydantic import TypeAdapter
+
+    from app.core import compression
+    from app.core.serialization import json_response, rows_as_dicts
+    from app.schemas.report import ReportPage, ReportResponse, ReportSummary, ReportSummaryPage, ReportView
+    from app.schemas.user import UserResponse
+    from app.services import report_service
+
+    page_adapter = TypeAdapter(Union[ReportPage, ReportSummaryPage])
+    users_adapter = TypeAdapter(List[UserResponse])
+    encoding = compression.supported()[0] if compression.supported() else "-"
+
+    br = ["br bytes"] if compression.brotli is not None else []
+    header = ["payload", "rows", "pydantic ms", "orjson ms", "speedup", "json bytes", "gzip bytes", *br, f"{encoding} ms"]
+    print(" ".join(f"{h:>12}" if i else f"{h:<16}" for i, h in enumerate(header)))
+
+    reports = make_reports(max(args.sizes) + 1)
+    users = make_users(max(args.sizes))
+
+    for size in args.sizes:
+        rows = reports[: size + 1]
+        cases = [
+            (
+                "reports full",
+                # previous path: models per row, then response_model validation and dump
+                lambda: page_adapter.dump_json(page_adapter.validate_python(ReportPage(
+                    items=[ReportResponse.model_validate(r) for r in rows[:size]],
+                    next_cursor=report_service.encode_cursor(rows[size - 1]),
+                ))),
+                lambda: json_response(report_service.build_page(rows, size)).body,
+            ),
+            (
+                "reports summary",
+                lambda: page_adapter.dump_json(page_adapter.validate_python(ReportSummaryPage(
+                    items=[ReportSummary.model_validate(r) for r in rows[:size]],
+                    next_cursor=report_service.encode_cursor(rows[size - 1]),
+                ))),
+                lambda: json_response(report_service.build_page(rows, size, ReportView.summary)).body,
+            ),
+            (
+                "users",
+                lambda: users_adapter.dump_json(users_adapter.validate_python(users[:size])),
+                lambda: json_response(rows_as_dicts(UserResponse, users[:size])).body,
+            ),
+        ]
+        for name, before, after in cases:
+            before_ms, before_body = timed(before, args.rounds)
+            after_ms, after_body = timed(after, args.rounds)
+            assert json.loads(before_body) == json.loads(after_body), f"{name}: outputs differ"
+            cells = [
+                f"{size:>12}", f"{before_ms:>12.2f}", f"{after_ms:>12.2f}", f"{before_ms / after_ms:>11.1f}x",
+                f"{len(after_body):>12}", *(f"{c:>12}" for c in compressed_sizes(after_body)),
+                f"{compress_ms(after_body):>12.2f}" if encoding != "-" else f"{'-':>12}",
+            ]
+            print(f"{name:<16} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
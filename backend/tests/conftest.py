@@ -0,0 +1,77 @@
+# Settings are read when app modules are imported, so the test environment is
+# set up before anything from app is loaded: a throwaway SQLite database,
+# inline password hashing and jobs, no Gemini key
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="kindsteps-tests-")
+
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{WORKDIR}/test.db",
+    PHOTO_STORAGE_DIR=os.path.join(WORKDIR, "photos"),
+    PASSWORD_HASH_WORKERS="0",
+    IMAGE_WORKERS="0",
+    JOBS_BACKEND="memory",
+    JOBS_WORKERS="0",
+    GEMINI_API_KEY="",
+    SLOW_QUERY_MS="0",
+)
+os.environ.pop("VERCEL", None)
+sys.path.insert(0, BACKEND)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    import app.db.base  # noqa: registers every model
+    from app.db.session import Base, get_engine
+
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
+
+
+# statements sent to the database inside the block: with count_queries() as n: ...; n[0]
+@pytest.fixture
+def count_queries(engine):
+    from sqlalchemy import event
+
+    @contextmanager
+    def counting():
+        count = [0]
+
+        def before_cursor_execute(*_):
+            count[0] += 1
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield count
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counting
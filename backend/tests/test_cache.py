@@ -0,0 +1,16 @@
+import os
+
+from app.core.cache import DiskCache
+
+
+def test_disk_cache_size_tracks_overwrites_and_expiry(tmp_path):
+    cache = DiskCache(str(tmp_path), ttl=60, max_bytes=10_000)
+
+    for _ in range(5):
+        cache.set("key", {"value": "x" * 100})
+    assert cache._size == os.path.getsize(tmp_path / "key.json")
+
+    os.utime(tmp_path / "key.json", (0, 0))
+    assert cache.get("key") is None
+    assert not (tmp_path / "key.json").exists()
+    assert cache._size == 0
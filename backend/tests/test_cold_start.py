@@ -0,0 +1,51 @@
+# Importing the app on serverless must stay cheap: no SDKs that only some
+# routes need and no database engine, also after starting up and serving
+# /health (benchmarks/bench_cold_start.py times it)
+
+import json
+import os
+import subprocess
+import sys
+
+from conftest import BACKEND, WORKDIR
+
+CHILD = r"""
+import json, sys
+import app.main
+from app.db.session import get_async_engine, get_engine
+
+def engines():
+    return get_engine.cache_info().currsize + get_async_engine.cache_info().currsize
+
+result = {"modules": sorted(sys.modules), "engines": engines()}
+
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    result["health"] = client.get("/health").status_code
+result["engines_after_health"] = engines()
+print(json.dumps(result))
+"""
+
+
+def test_cold_start_loads_no_heavy_modules_or_engine():
+    env = dict(os.environ)
+    env.update(
+        VERCEL="1",
+        DATABASE_URL=f"sqlite:///{WORKDIR}/cold.db",
+        GEMINI_API_KEY="cold-start",
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    env.pop("JOBS_WORKERS", None)
+    env.pop("PASSWORD_HASH_WORKERS", None)
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=BACKEND, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+
+    loaded = set(result["modules"])
+    for module in ("google.genai", "jose", "passlib"):
+        assert module not in loaded, f"{module} is imported by app.main"
+    assert result["engines"] == 0
+    assert result["health"] == 200
+    assert result["engines_after_health"] == 0
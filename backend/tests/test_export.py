@@ -0,0 +1,13 @@
+import pytest
+
+from app.services.export_service import _cell
+
+
+@pytest.mark.parametrize("value", ["+91 98765 43210", "+1 (555) 010-0199", "-12.5", "555-0100", "Park Road"])
+def test_plain_values_are_exported_as_is(value):
+    assert _cell(value) == value
+
+
+@pytest.mark.parametrize("value", ["=HYPERLINK(\"http://x\")", "+SUM(A1:A9)", "-1+cmd|' /C calc'!A0", "@SUM(1)"])
+def test_formulas_are_neutralized(value):
+    assert _cell(value) == "'" + value
@@ -0,0 +1,26 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app.core import images
+from app.core.images import InvalidImageError, check_image, process_image
+
+
+def png(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("L", (width, height)).save(out, format="PNG")
+    return out.getvalue()
+
+
+# Pillow only warns between MAX_IMAGE_PIXELS and twice that, so this is checked by us
+def test_images_over_the_pixel_limit_are_rejected(monkeypatch):
+    monkeypatch.setattr(images, "MAX_PIXELS", 100 * 100)
+    data = png(101, 100)
+
+    with pytest.raises(InvalidImageError):
+        check_image(io.BytesIO(data))
+    with pytest.raises(InvalidImageError):
+        process_image(data, 64, 32, "WEBP", 80, with_thumbnail=False)
+
+    check_image(io.BytesIO(png(100, 100)))
@@ -0,0 +1,33 @@
+from app.core import jobs
+
+calls = []
+
+
+@jobs.handler("test_flaky", max_attempts=3)
+def flaky(n: int):
+    calls.append(n)
+    raise RuntimeError("unavailable")
+
+
+@jobs.handler("test_noop")
+def noop():
+    return "done"
+
+
+# with no workers a job gets one attempt per enqueue, retries wait for their backoff
+def test_inline_jobs_retry_with_backoff():
+    job = jobs.enqueue("test_flaky", {"n": 1})
+
+    assert calls == [1]
+    assert job.status == jobs.JobStatus.queued.value
+    assert job.attempts == 1
+    assert job.run_at > job.started_at
+
+    jobs.enqueue("test_noop", {})
+    assert calls == [1]  # not due yet
+
+    job.run_at = jobs.utcnow()
+    jobs.enqueue("test_noop", {})
+    assert calls == [1, 1]
+    assert job.attempts == 2
+    assert job.status == jobs.JobStatus.queued.value
@@ -0,0 +1,61 @@
+import io
+import os
+
+from PIL import Image
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+from app.services.photo_storage import get_photo_storage
+
+
+def jpeg(size: int = 64) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (size, size), "orange").save(out, format="JPEG")
+    return out.getvalue()
+
+
+def reporter_headers(db) -> dict:
+    email = "photos@kindsteps.org"
+    user = db.execute(select(User).where(User.email == email)).scalar()
+    if user is None:
+        user = User(full_name="Photos", email=email, hashed_password="x", role=UserRole.user)
+        db.add(user)
+        db.commit()
+    return {"Authorization": f"Bearer {create_access_token(user.email, user_id=user.id)}"}
+
+
+def create(client, headers, photo: bytes):
+    form = {"condition": "Injured", "description": "d", "location": "l", "contact_name": "n", "contact_phone": "1"}
+    return client.post("/reports/", data=form, files={"photo": ("dog.jpg", photo, "image/jpeg")}, headers=headers)
+
+
+def test_photo_is_staged_processed_and_served(client, db):
+    headers = reporter_headers(db)
+    response = create(client, headers, jpeg())
+    assert response.status_code == 201, response.text
+    report_id = response.json()["id"]
+
+    photo = client.get(f"/reports/{report_id}/photo", headers=headers)
+    assert photo.status_code == 200
+    assert Image.open(io.BytesIO(photo.content)).size == (64, 64)
+
+
+def test_oversized_photo_is_refused(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "PHOTO_MAX_BYTES", 1024)
+    get_photo_storage.cache_clear()
+    try:
+        response = create(client, reporter_headers(db), jpeg(512) + os.urandom(2048))
+    finally:
+        get_photo_storage.cache_clear()
+    assert response.status_code == 413
+
+
+def test_missing_photo_blob_is_not_found(client, db):
+    headers = reporter_headers(db)
+    report_id = create(client, headers, jpeg()).json()["id"]
+    key = client.get(f"/reports/{report_id}/photo", headers=headers).headers["etag"].strip('"')
+    get_photo_storage().delete(key)
+
+    assert client.get(f"/reports/{report_id}/photo", headers=headers).status_code == 404
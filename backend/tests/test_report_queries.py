@@ -0,0 +1,115 @@
+# Report lists must cost a fixed number of statements whatever their length
+# (the assigned team is eager loaded, never fetched per row: N+1) and page
+# through every row exactly once
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.security import create_access_token
+from app.models.report import Report
+from app.models.user import User, UserRole
+
+TEAMS = 10
+
+
+@pytest.fixture
+def users(db):
+    db.execute(delete(Report))
+    db.execute(delete(User))
+    db.expunge_all()  # bulk deletes leave the old objects behind, their ids are reused
+    admin = User(full_name="Admin", email="admin@kindsteps.org", hashed_password="x", role=UserRole.admin)
+    reporter = User(full_name="Reporter", email="reporter@kindsteps.org", hashed_password="x", role=UserRole.user)
+    teams = [
+        User(full_name=f"Team {i}", email=f"team{i}@kindsteps.org", hashed_password="x",
+             phone=f"555-{i:04d}", role=UserRole.rescue_team)
+        for i in range(TEAMS)
+    ]
+    db.add_all([admin, reporter, *teams])
+    db.commit()
+    return admin, reporter, teams
+
+
+def add_reports(db, reporter, teams, count: int) -> list:
+    db.execute(delete(Report))
+    # forget the deleted reports (their ids are reused), the users stay attached
+    for report in [o for o in db.identity_map.values() if isinstance(o, Report)]:
+        db.expunge(report)
+    reports = [
+        Report(
+            reporter_id=reporter.id,
+            condition="Injured",
+            description=f"Report {i}",
+            location="Park Road",
+            contact_name="Reporter",
+            contact_phone="555",
+            # every row on its own team (and some on the first team's list)
+            assigned_team_id=teams[0].id if i % 2 else teams[i % TEAMS].id,
+        )
+        for i in range(count)
+    ]
+    db.add_all(reports)
+    db.commit()
+    return reports
+
+
+def auth(user) -> dict:
+    token = create_access_token(user.email, user_id=user.id)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def statements(client, count_queries, path: str, headers: dict, **params) -> int:
+    client.get(path, params=params, headers=headers)  # principal cached before counting
+    with count_queries() as n:
+        response = client.get(path, params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return n[0]
+
+
+@pytest.mark.parametrize(
+    "path, role, params",
+    [
+        ("/reports/", "admin", {"limit": 200}),
+        ("/reports/", "admin", {"limit": 200, "view": "summary"}),
+        ("/reports/", "reporter", {"limit": 200}),
+        ("/admin/reports", "admin", {"limit": 200}),
+        ("/reports/my-assignments", "team", {}),
+        ("/reports/my-assignments", "team", {"view": "summary"}),
+    ],
+)
+def test_list_statements_do_not_grow_with_rows(client, db, users, count_queries, path, role, params):
+    admin, reporter, teams = users
+    headers = auth({"admin": admin, "reporter": reporter, "team": teams[0]}[role])
+
+    counts = []
+    for rows in (5, 50):
+        reports = add_reports(db, reporter, teams, rows)
+        expected = [r for r in reports if role != "team" or r.assigned_team_id == teams[0].id]
+        response = client.get(path, params=params, headers=headers)
+        items = response.json()
+        items = items["items"] if isinstance(items, dict) else items
+        assert len(items) == len(expected)
+        assert all(item["assigned_team_name"] for item in items)
+        counts.append(statements(client, count_queries, path, headers, **params))
+
+    assert counts[0] == counts[1], f"{path}: {counts[0]} statements for 5 reports, {counts[1]} for 50"
+    assert counts[0] == 1
+
+
+# reports created in the same second (SQLite server defaults) must still page
+# through every row exactly once
+@pytest.mark.parametrize("view", ["full", "summary"])
+def test_pages_return_every_report_once(client, db, users, view):
+    admin, reporter, teams = users
+    reports = add_reports(db, reporter, teams, 25)
+
+    seen, cursor = [], None
+    for _ in range(len(reports)):
+        params = {"limit": 10, "view": view, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/reports/", params=params, headers=auth(admin)).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(r.id for r in reports)
+    assert len(seen) == len(set(seen))
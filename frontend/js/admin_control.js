@@ -1,6 +1,7 @@
 // Store loaded data
 let allReports = [];
 let allUsers = [];
+let reportPager = null;
 
 document.addEventListener("DOMContentLoaded", init);
 
@@ -18,14 +19,17 @@ async function init() {
                 ?.scrollIntoView({ behavior: "smooth" }));
 }
 
-// Attach filter events
+// Attach filter events (status/date are filtered by the server)
 function setupFilters() {
     ["status-filter","start-date","end-date"]
         .forEach(id => document.getElementById(id)
-        ?.addEventListener("change", applyAllFilters));
+        ?.addEventListener("change", loadReports));
 
     document.getElementById("admin-search")
         ?.addEventListener("input", applyAllFilters);
+
+    document.getElementById("reports-load-more")
+        ?.addEventListener("click", loadMoreReports);
 }
 
 // Fetch JSON helper
@@ -56,10 +60,44 @@ async function loadStats() {
 
 // ---------- LOAD DATA ----------
 async function loadReports() {
-    const data = await fetchJSON(`${API_BASE_URL}/admin/reports`);
-    if (!data) return;
+    const params = {};
+
+    const status = document.getElementById("status-filter")?.value;
+    const start = document.getElementById("start-date")?.value;
+    const end = document.getElementById("end-date")?.value;
+
+    if (status && status !== "all") params.status = status;
+    if (start) params.created_from = `${start}T00:00:00`;
+    if (end) params.created_to = `${end}T23:59:59.999`;
+
+    // first page only, older reports come with "Load more"
+    const pager = reportPager = createPager(`${API_BASE_URL}/admin/reports`, params);
+    const data = await pager.next();
+    if (!data || pager !== reportPager) return;
     allReports = data;
     applyAllFilters();
+    updateLoadMore();
+}
+
+async function loadMoreReports() {
+    const pager = reportPager;
+    if (!pager || pager.done) return;
+
+    const button = document.getElementById("reports-load-more");
+    if (button) button.disabled = true;
+
+    const data = await pager.next();
+    if (button) button.disabled = false;
+    if (!data || pager !== reportPager) return;   // filters changed meanwhile
+
+    allReports = allReports.concat(data);
+    applyAllFilters();
+    updateLoadMore();
+}
+
+function updateLoadMore() {
+    const button = document.getElementById("reports-load-more");
+    if (button) button.hidden = !reportPager || reportPager.done;
 }
 
 async function loadUsers() {
@@ -183,7 +221,9 @@ async function deleteReport(id) {
 
     if (res.ok){
         alert("Report deleted");
-        loadReports();
+        // keep the pages already loaded
+        allReports = allReports.filter(r => r.id !== id);
+        applyAllFilters();
         loadStats();
     } else {
         const err = await res.json();
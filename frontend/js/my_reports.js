@@ -2,10 +2,21 @@
 document.addEventListener("DOMContentLoaded", () => {
     checkLogin();
     loadReports();
+    subscribeReportEvents(() => loadReports());
+
+    document.getElementById("reports-load-more")
+        ?.addEventListener("click", loadMoreReports);
 });
 
 
+const PAGE_SIZE = 24;
+
+let reports = [];
+let pager = null;
+
+
 // ---------- LOAD REPORTS ----------
+// First page only; live updates reload as many reports as are already shown
 async function loadReports() {
 
     const box = document.getElementById("my-reports-grid");
@@ -13,20 +24,15 @@ async function loadReports() {
 
     try {
 
-        const res = await fetchWithAuth(`${API_BASE_URL}/reports/`);
-        if (!res.ok) return show(box, "Failed to load reports", true);
-
-        const reports = await res.json();
-
-        if (!reports.length) return show(box, "No reports yet");
+        const limit = Math.min(Math.max(reports.length, PAGE_SIZE), 200);
+        const current = pager = createPager(`${API_BASE_URL}/reports/`, { view: "summary" }, limit);
 
-        // Show newest reports first
-        box.innerHTML = reports
-            .sort((a,b)=>new Date(b.created_at)-new Date(a.created_at))
-            .map((r,i)=>card(r,i))
-            .join("");
+        const items = await current.next();
+        if (current !== pager) return;
+        if (!items) return show(box, "Failed to load reports", true);
 
-        lucide?.createIcons();
+        reports = items;
+        render(box);
 
     } catch {
         show(box, "Server error", true);
@@ -34,6 +40,40 @@ async function loadReports() {
 }
 
 
+async function loadMoreReports() {
+
+    const current = pager;
+    if (!current || current.done) return;
+
+    const button = document.getElementById("reports-load-more");
+    button.disabled = true;
+
+    try {
+        const items = await current.next();
+        if (items && current === pager) {
+            reports = reports.concat(items);
+            render(document.getElementById("my-reports-grid"));
+        }
+    } finally {
+        button.disabled = false;
+    }
+}
+
+
+function render(box) {
+
+    const button = document.getElementById("reports-load-more");
+    if (button) button.hidden = !pager || pager.done;
+
+    if (!reports.length) return show(box, "No reports yet");
+
+    // Newest first (the API already sends them in that order)
+    box.innerHTML = reports.map((r,i)=>card(r,i)).join("");
+
+    lucide?.createIcons();
+}
+
+
 // ---------- CREATE CARD ----------
 function card(r, i){
 
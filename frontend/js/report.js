@@ -101,10 +101,11 @@ function setupAIScan() {
       const form = new FormData();
       form.append("photo", photo);
 
-      const res = await fetchWithAuth(`${API_BASE_URL}/reports/ai-analyze`, { method: "POST", body: form });
+      // analysis runs as a background job, the request returns right away
+      const res = await fetchWithAuth(`${API_BASE_URL}/reports/ai-analyze?background=true`, { method: "POST", body: form });
       if (!res.ok) throw new Error();
 
-      const data = await res.json();
+      const data = await waitForJob(await res.json());
 
       // Fill description
       if (data.description)
@@ -1,6 +1,7 @@
 document.addEventListener("DOMContentLoaded", () => {
     checkLogin();
     load();
+    subscribeReportEvents(() => load());
 });
 
 
@@ -12,7 +13,7 @@ async function load() {
 
     try {
 
-        const res = await fetchWithAuth(`${API_BASE_URL}/reports/my-assignments`);
+        const res = await fetchWithAuth(`${API_BASE_URL}/reports/my-assignments?view=summary`);
         if (!res.ok) return message(grid, "Unable to load cases");
 
         const reports = await res.json();
@@ -112,9 +113,6 @@ function card(r,i){
         (s==="active"||s==="in_progress") ? "in_progress" :
         "received";
 
-    const desc=r.description||"";
-    const short=desc.substring(0,60)+(desc.length>60?"...":"");
-
     return `
     <div class="case-card" style="animation-delay:${i*100}ms">
 
@@ -134,8 +132,8 @@ function card(r,i){
             </li>
 
             <li>
-                <i data-lucide="file-text"></i>
-                <span>${short}</span>
+                <i data-lucide="alert-triangle"></i>
+                <span>${r.priority} priority</span>
             </li>
 
             <li>
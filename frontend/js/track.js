@@ -12,6 +12,11 @@ document.addEventListener("DOMContentLoaded", () => {
         load(id);
     }
 
+    // refresh when the tracked report changes
+    subscribeReportEvents(e => {
+        if (String(e.id) === input.value.trim() && e.type !== "deleted") load(e.id);
+    });
+
     btn.onclick = () => {
         const val = input.value.trim();
         if (!val) return alert("Please enter a Tracking ID");
@@ -78,6 +78,68 @@ async function fetchWithAuth(url, options = {}) {
 }
 
 
+// Page through a paginated list endpoint on demand: each next() fetches one page
+// following next_cursor and returns its items (null on error); done when none are left
+function createPager(url, params = {}, limit = 50) {
+
+    let cursor = null;
+
+    return {
+        done: false,
+
+        async next() {
+            const query = new URLSearchParams({ ...params, limit });
+            if (cursor) query.set("cursor", cursor);
+
+            const res = await fetchWithAuth(`${url}?${query}`);
+            if (!res.ok) return null;
+
+            const page = await res.json();
+            cursor = page.next_cursor;
+            this.done = !cursor;
+            return page.items;
+        }
+    };
+}
+
+
+// -------- BACKGROUND JOBS --------
+
+// Poll /jobs/{id} until the job is done, resolves with its result (throws when it failed)
+async function waitForJob(job, intervalMs = 1000, timeoutMs = 120000) {
+
+    const deadline = Date.now() + timeoutMs;
+
+    while (job.status !== "succeeded") {
+        if (job.status === "failed" || Date.now() > deadline) throw new Error(job.error || "Job timed out");
+
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+
+        const res = await fetchWithAuth(`${API_BASE_URL}/jobs/${job.id}`);
+        if (!res.ok) throw new Error("Job not found");
+        job = await res.json();
+    }
+
+    return job.result;
+}
+
+
+// -------- LIVE UPDATES --------
+
+// Listen to report changes visible to the logged-in user (created/updated/assigned/deleted).
+// EventSource reconnects by itself, the token goes in the URL as it cannot send headers.
+function subscribeReportEvents(onEvent) {
+
+    const token = getToken();
+    if (!token || !window.EventSource) return null;
+
+    const source = new EventSource(`${API_BASE_URL}/reports/stream?token=${encodeURIComponent(token)}`);
+    source.onmessage = e => onEvent(JSON.parse(e.data));
+
+    return source;
+}
+
+
 // -------- NAVBAR --------
 
 function setupNavbar() {
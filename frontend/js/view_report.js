@@ -74,6 +74,19 @@ async function updateCase(id) {
     }
 }
 
+// PHOTO (served by the API, needs the auth header)
+async function loadPhoto(id, img) {
+    try {
+        const res = await fetchWithAuth(`${API_BASE_URL}/reports/${id}/photo`);
+        if (!res.ok) return;
+
+        img.src = URL.createObjectURL(await res.blob());
+        img.style.display = "block";
+    } catch (e) {
+
+    }
+}
+
 // RENDER HELPERS
 function safeText(id, val) {
     const el = getEl(id);
@@ -96,13 +109,8 @@ function renderReport(r) {
     }
 
     const img = getEl("case-image");
-    if (img && r.photo_url) {
-        let src = r.photo_url;
-        if (!src.startsWith("data:image") && !src.startsWith("http")) {
-            src = `data:image/jpeg;base64,${src}`;
-        }
-        img.src = src;
-        img.style.display = "block";
+    if (img && r.photo_key) {
+        loadPhoto(r.id, img);
     }
 
     // MAP Initialization with safety